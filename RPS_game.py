@@ -1,37 +1,55 @@
-# DO NOT MODIFY THIS FILE
+# The reference match loop, the bots and match seeding.
 
+import copy
 import random
+from collections import OrderedDict
+from typing import Protocol
 
+from rules import COUNTER, MOVE_CODE, MOVES, OUTCOME, R, RESULT_KEYS, S
 
-def play(player1, player2, num_games, verbose=False):
+WINNER_TEXT = ("Player 1 wins.", "Player 2 wins.", "Tie.")  # by result code
+
+
+def play(player1, player2, num_games, verbose=False, probe=None, stop=None, seed=None,
+         cache=None):
     p1_prev_play = ""
     p2_prev_play = ""
-    results = {"p1": 0, "p2": 0, "tie": 0}
-
-    for _ in range(num_games):
+    counts = [0, 0, 0]
+    if seed is not None:
+        player1, player2 = seed_players(seed, player1, player2)
+    key = hit = None
+    if cache is not None and seed is not None and not verbose and probe is None and stop is None:
+        # resultcache.ResultCache: seeded matches are only played once
+        key = cache.key(__name__, player1, player2, num_games, seed)
+        hit = cache.get(key, history=False) if key else None
+    if probe is not None:
+        player1, player2 = probe.attach(player1, player2)
+
+    for _ in range(num_games if hit is None else 0):
         p1_play = player1(p2_prev_play)
         p2_play = player2(p1_prev_play)
 
-        if p1_play == p2_play:
-            results["tie"] += 1
-            winner = "Tie."
-        elif (p1_play == "P" and p2_play == "R") or (
-                p1_play == "R" and p2_play == "S") or (p1_play == "S"
-                                                       and p2_play == "P"):
-            results["p1"] += 1
-            winner = "Player 1 wins."
-        elif p2_play == "P" and p1_play == "R" or p2_play == "R" and p1_play == "S" or p2_play == "S" and p1_play == "P":
-            results["p2"] += 1
-            winner = "Player 2 wins."
+        result = OUTCOME[MOVE_CODE[p1_play]][MOVE_CODE[p2_play]]
+        counts[result] += 1
 
         if verbose:
             print("Player 1:", p1_play, "| Player 2:", p2_play)
-            print(winner)
+            print(WINNER_TEXT[result])
             print()
 
         p1_prev_play = p1_play
         p2_prev_play = p2_play
+        if probe is not None:
+            probe.end_round()
+        if stop is not None and stop.update(result):
+            break
 
+    if hit is not None:
+        results = hit[0]
+    else:
+        results = dict(zip(RESULT_KEYS, counts))
+        if key:
+            cache.put(key, results)
     games_won = results['p2'] + results['p1']
 
     if games_won == 0:
@@ -45,69 +63,505 @@ def play(player1, player2, num_games, verbose=False):
     return (win_rate)
 
 
-def easy1(prev_play, counter=[0]):
+# ---------- Bots ----------
+# Every bot is an object holding its own state, so any number of them can
+# play at once (even against themselves). The plain functions below wrap
+# one shared instance each and keep the original call style working.
+class Bot(Protocol):
+    def reset(self):
+        ...
+
+    def __call__(self, prev_play):
+        ...
+
+
+# easy2 also counts the empty first "move", as code 3
+_NO_MOVE = 3
+_EASY2_ORDER = (0, 1, 2, _NO_MOVE)
+
+
+# ---------- Rolling window ----------
+class RollingCounter:
+    # The last `size` items in a fixed ring buffer, with a count per symbol
+    # kept up to date on every push, so lookups never rescan the window.
+    __slots__ = ("size", "symbols", "buf", "counts", "pos", "filled")
+
+    def __init__(self, size, symbols):
+        self.size = size
+        self.symbols = tuple(symbols)
+        self.clear()
+
+    def clear(self):
+        self.buf = [None] * self.size
+        self.counts = dict.fromkeys(self.symbols, 0)
+        self.pos = 0
+        self.filled = 0
+
+    def push(self, item):
+        if self.filled == self.size:
+            self.counts[self.buf[self.pos]] -= 1
+        else:
+            self.filled += 1
+        self.buf[self.pos] = item
+        self.counts[item] += 1
+        self.pos = (self.pos + 1) % self.size
+
+    def __len__(self):
+        return self.filled
+
+    def __getitem__(self, i):
+        # counted back from the newest item: window[-1] is the last push
+        if not -self.filled <= i < 0:
+            raise IndexError(i)
+        return self.buf[(self.pos + i) % self.size]
+
+    def count(self, item):
+        return self.counts[item]
+
+    def most_common(self):
+        # ties go to the symbol listed first
+        return max(self.symbols, key=self.counts.__getitem__)
+
+
+# fast_forward(my_moves, opp_moves) puts a freshly reset bot into the state
+# it would have after playing those rounds (move codes R=0, P=1, S=2), i.e.
+# after being called with "", opp_moves[0], ..., opp_moves[-2].
+
+
+class Easy1Bot:
+    __slots__ = ("counter",)
+    choices = ("R", "R", "P", "P", "S")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.counter = 0
+
+    def __call__(self, prev_play):
+        self.counter += 1
+        return self.choices[self.counter % len(self.choices)]
+
+    def fast_forward(self, my_moves, opp_moves):
+        self.counter = len(opp_moves)
+
+
+class Easy2Bot:
+    __slots__ = ("last_ten",)
+
+    def __init__(self):
+        # ties go to the first of R, P, S, '' (set order changed from run to run)
+        self.last_ten = RollingCounter(10, _EASY2_ORDER)
+
+    def reset(self):
+        self.last_ten.clear()
+
+    def __call__(self, prev_opponent_play):
+        self.last_ten.push(MOVE_CODE[prev_opponent_play] if prev_opponent_play else _NO_MOVE)
+        most_frequent = self.last_ten.most_common()
+
+        if most_frequent == _NO_MOVE:
+            most_frequent = S
 
-    counter[0] += 1
-    choices = ["R", "R", "P", "P", "S"]
-    return choices[counter[0] % len(choices)]
+        return MOVES[COUNTER[most_frequent]]
 
+    def fast_forward(self, my_moves, opp_moves):
+        n = len(opp_moves)
+        seen = [int(m) for m in opp_moves[max(0, n - 11):n - 1]]
+        self.reset()
+        for move in ([_NO_MOVE] + seen)[-10:] if n else []:
+            self.last_ten.push(move)
 
-def easy2(prev_opponent_play, opponent_history=[]):
-    opponent_history.append(prev_opponent_play)
-    last_ten = opponent_history[-10:]
-    most_frequent = max(set(last_ten), key=last_ten.count)
 
-    if most_frequent == '':
-        most_frequent = "S"
+class MediumBot:
+    __slots__ = ()
 
-    ideal_response = {'P': 'S', 'R': 'P', 'S': 'R'}
-    return ideal_response[most_frequent]
+    def reset(self):
+        pass
+
+    def __call__(self, prev_opponent_play):
+        move = MOVE_CODE[prev_opponent_play] if prev_opponent_play else R
+        return MOVES[COUNTER[move]]
+
+    def fast_forward(self, my_moves, opp_moves):
+        pass
+
+
+class Medium2Bot:
+    __slots__ = ("last_two", "play_order")
+
+    def __init__(self):
+        # only the previous move is ever read back
+        self.last_two = RollingCounter(2, (0, 1, 2))
+        self.reset()
+
+    def reset(self):
+        self.last_two.clear()
+        # play_order[prev * 3 + next]: how often `next` followed `prev`
+        self.play_order = [0] * 9
+
+    def __call__(self, prev_opponent_play):
+        move = MOVE_CODE[prev_opponent_play] if prev_opponent_play else R
+        self.last_two.push(move)
+        if len(self.last_two) == 2:
+            self.play_order[self.last_two[-2] * 3 + move] += 1
+
+        # the most frequent follower of `move`; ties go to R, then P
+        followers = self.play_order[move * 3:move * 3 + 3]
+        prediction = followers.index(max(followers))
+        return MOVES[COUNTER[prediction]]
+
+    def fast_forward(self, my_moves, opp_moves):
+        # the history it saw is R (for the empty first move), then opp_moves[:-1]
+        self.reset()
+        seen = ([R] + [int(m) for m in opp_moves[:-1]]) if len(opp_moves) else []
+        for a, b in zip(seen, seen[1:]):
+            self.play_order[a * 3 + b] += 1
+        for move in seen[-2:]:
+            self.last_two.push(move)
+
+
+class RandomBot:
+    __slots__ = ("rng",)
+
+    def __init__(self, rng=random):
+        self.rng = rng
+
+    def reset(self):
+        pass
+
+    # one rng.random() per move, the same draw rng.choices(MOVES, k=n)
+    # makes per move, so bulk and per-round play share one stream
+    def __call__(self, prev_opponent_play):
+        return MOVES[int(self.rng.random() * 3)]
+
+    def fast_forward(self, my_moves, opp_moves):
+        # the stream has no skip-ahead; draw and discard one move per round
+        self.rng.choices(MOVES, k=len(opp_moves))
+
+
+# ---------- Markov chain pattern tables ----------
+# Patterns are base-3 integer codes (R=0, P=1, S=2) so every update and
+# lookup is plain list indexing instead of building and hashing strings.
+# Count tables are flat, preallocated (rows, 3) arrays: pattern row r keeps
+# its R/P/S successor counts at r*3 .. r*3+2, next to a running row total
+# and the index of its most frequent successor.
+MARKOV_ORDER = 5       # longest opponent-only pattern
+MARKOV_MY_ORDER = 2    # longest my|opponent combined pattern
+
+# Dense tables grow as 3**order, so patterns longer than MARKOV_DENSE_ORDER
+# live in a PatternStore holding at most MARKOV_MAX_PATTERNS rows.
+MARKOV_DENSE_ORDER = 6
+MARKOV_MAX_PATTERNS = 4096
+
+
+class PatternStore:
+    # Bounded pattern -> [R, P, S, total, best] rows. When full, adding a new
+    # pattern evicts the least recently used one ("lru") or the one seen the
+    # fewest times ("lfu", oldest first among equals).
+    __slots__ = ("capacity", "policy", "rows", "hits", "misses", "evictions",
+                 "_by_count", "_min_count")
+
+    def __init__(self, capacity=MARKOV_MAX_PATTERNS, policy="lru"):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"unknown eviction policy {policy!r}")
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.policy = policy
+        self.hits = self.misses = self.evictions = 0
+        self.clear()
+
+    def clear(self):
+        self.rows = OrderedDict() if self.policy == "lru" else {}
+        self._by_count = {}  # lfu: total -> patterns with that total, oldest first
+        self._min_count = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get(self, key):
+        row = self.rows.get(key)
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.policy == "lru":
+            self.rows.move_to_end(key)
+        return row
+
+    def add(self, key, move):
+        rows = self.rows
+        row = rows.get(key)
+        if row is None:
+            if len(rows) >= self.capacity:
+                self._evict()
+            row = rows[key] = [0, 0, 0, 0, move]
+        elif self.policy == "lru":
+            rows.move_to_end(key)
+
+        total = row[3]
+        if self.policy == "lfu":
+            self._recount(key, total)
+        c = row[move] + 1
+        row[move] = c
+        row[3] = total + 1
+        b = row[4]
+        if c > row[b] or (c == row[b] and move < b):
+            row[4] = move
+
+    def _recount(self, key, total):
+        by_count = self._by_count
+        if total:
+            bucket = by_count[total]
+            del bucket[key]
+            if not bucket:
+                del by_count[total]
+                if self._min_count == total:
+                    self._min_count = total + 1
+        else:
+            self._min_count = 1
+        by_count.setdefault(total + 1, {})[key] = None
+
+    def _evict(self):
+        if self.policy == "lru":
+            self.rows.popitem(last=False)
+        else:
+            bucket = self._by_count[self._min_count]
+            key = next(iter(bucket))
+            del bucket[key]
+            if not bucket:
+                del self._by_count[self._min_count]
+                self._min_count = min(self._by_count, default=0)
+            del self.rows[key]
+        self.evictions += 1
+
+    def stats(self):
+        return {"patterns": len(self.rows), "capacity": self.capacity, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+
+class MarkovTables:
+    __slots__ = (
+        "order", "my_order", "opp_offsets", "combined_offsets", "opp_rows",
+        "combined_rows", "opp_mods", "opp_counts", "opp_totals", "opp_best",
+        "combined_counts", "opp_codes", "my_codes", "opp_len", "my_len",
+        "recent", "dense_order", "store",
+    )
+
+    def __init__(self, order=MARKOV_ORDER, my_order=MARKOV_MY_ORDER,
+                 max_patterns=MARKOV_MAX_PATTERNS, eviction="lru"):
+        if order < 1:
+            raise ValueError(f"order must be at least 1, got {order}")
+        if not 0 <= my_order <= order:
+            raise ValueError(f"my_order must be between 0 and order ({order}), got {my_order}")
+        if max_patterns < 1:
+            raise ValueError(f"max_patterns must be at least 1, got {max_patterns}")
+        self.order = order
+        self.my_order = my_order
+        self.dense_order = min(order, MARKOV_DENSE_ORDER)
+        # first row of each pattern length (also the store keys past dense_order)
+        self.opp_offsets = [sum(3 ** j for j in range(1, k)) for k in range(1, order + 1)]
+        self.combined_offsets = [sum(9 ** j for j in range(1, k)) for k in range(1, my_order + 1)]
+        self.opp_rows = sum(3 ** k for k in range(1, self.dense_order + 1))
+        self.combined_rows = sum(9 ** k for k in range(1, my_order + 1))
+        self.opp_mods = [3 ** k for k in range(1, order + 1)]
+        self.store = PatternStore(max_patterns, eviction) if order > self.dense_order else None
+        self.reset()
+
+    def reset(self):
+        self.opp_counts = [0] * (self.opp_rows * 3)
+        self.opp_totals = [0] * self.opp_rows
+        self.opp_best = [0] * self.opp_rows
+        self.combined_counts = [0] * (self.combined_rows * 3)
+        # opp_codes[k-1] is the code of the last k opponent moves
+        self.opp_codes = [0] * self.order
+        self.my_codes = [0] * self.my_order
+        self.opp_len = 0
+        self.my_len = 0
+        self.recent = RollingCounter(5, (0, 1, 2))
+        if self.store is not None:
+            self.store.clear()
+
+    def update(self, move):
+        counts, totals, best = self.opp_counts, self.opp_totals, self.opp_best
+        codes, mods = self.opp_codes, self.opp_mods
+
+        # count `move` as the successor of every pattern that preceded it
+        seen = min(self.order, self.opp_len)
+        for k in range(self.dense_order, seen):
+            self.store.add(self.opp_offsets[k] + codes[k], move)
+        for k in range(min(self.dense_order, seen)):
+            row = self.opp_offsets[k] + codes[k]
+            i = row * 3
+            c = counts[i + move] + 1
+            counts[i + move] = c
+            totals[row] += 1
+            b = best[row]
+            if c > counts[i + b] or (c == counts[i + b] and move < b):
+                best[row] = move
+
+        for k in range(min(self.my_order, self.my_len, self.opp_len)):
+            row = self.combined_offsets[k] + self.my_codes[k] * mods[k] + codes[k]
+            self.combined_counts[row * 3 + move] += 1
+
+        for k in range(self.order):
+            codes[k] = (codes[k] * 3 + move) % mods[k]
+        self.opp_len += 1
+
+        self.recent.push(move)
+
+    def load_history(self, opp_moves, my_moves):
+        # Batch equivalent of update()/record_my_move() over a whole history:
+        # opp_moves are the opponent moves seen, my_moves the moves recorded
+        # after each of them (same length). Dense tables only.
+        import numpy as np
+
+        self.reset()
+        opp = np.asarray(opp_moves, dtype=np.int64)
+        mine = np.asarray(my_moves, dtype=np.int64)
+        n = len(opp)
+        if not n:
+            return
+
+        counts = np.zeros(self.opp_rows * 3, dtype=np.int64)
+        combined = np.zeros(self.combined_rows * 3, dtype=np.int64)
+        for k in range(1, self.dense_order + 1):
+            if n <= k:
+                break
+            # code of opp[t-k:t] for every successor opp[t], t = k..n-1
+            code = np.zeros(n - k, dtype=np.int64)
+            for j in range(k):
+                code = code * 3 + opp[j:n - k + j]
+            succ = opp[k:]
+            counts += np.bincount((self.opp_offsets[k - 1] + code) * 3 + succ, minlength=len(counts))
+
+            if k <= self.my_order:
+                my_code = np.zeros(n - k, dtype=np.int64)
+                for j in range(k):
+                    my_code = my_code * 3 + mine[j:n - k + j]
+                rows = self.combined_offsets[k - 1] + my_code * self.opp_mods[k - 1] + code
+                combined += np.bincount(rows * 3 + succ, minlength=len(combined))
+
+        table = counts.reshape(-1, 3)
+        self.opp_counts = counts.tolist()
+        self.opp_totals = table.sum(axis=1).tolist()
+        self.opp_best = table.argmax(axis=1).tolist()
+        self.combined_counts = combined.tolist()
+
+        tail = opp[-self.order:].tolist()
+        my_tail = mine[n - self.my_order:].tolist()  # (not [-0:] when my_order is 0)
+        for m in tail:
+            self.opp_codes = [(c * 3 + m) % mod for c, mod in zip(self.opp_codes, self.opp_mods)]
+        for m in my_tail:
+            self.my_codes = [(c * 3 + m) % mod for c, mod in zip(self.my_codes, self.opp_mods)]
+        self.opp_len = self.my_len = n
+        for move in opp[-5:].tolist():
+            self.recent.push(move)
+
+    def record_my_move(self, move):
+        mods = self.opp_mods
+        for k in range(self.my_order):
+            self.my_codes[k] = (self.my_codes[k] * 3 + move) % mods[k]
+        self.my_len += 1
+
+    def predict(self):
+        counts, totals, best = self.opp_counts, self.opp_totals, self.opp_best
+        prediction, best_confidence = None, 0
+
+        # longest pattern first; a shorter one must be strictly more confident
+        for k in range(min(self.order, self.opp_len) - 1, self.dense_order - 1, -1):
+            row = self.store.get(self.opp_offsets[k] + self.opp_codes[k])
+            if row is not None:
+                confidence = row[row[4]] / row[3]
+                if confidence > best_confidence:
+                    best_confidence, prediction = confidence, row[4]
+
+        for k in range(min(self.dense_order, self.opp_len) - 1, -1, -1):
+            row = self.opp_offsets[k] + self.opp_codes[k]
+            total = totals[row]
+            if total:
+                pred = best[row]
+                confidence = counts[row * 3 + pred] / total
+                if confidence > best_confidence:
+                    best_confidence, prediction = confidence, pred
+
+        if prediction is not None:
+            return prediction
+        if self.opp_len >= 3:
+            return self.recent.most_common()
+        return 0
+
+
+class MarkovChainBot:
+    __slots__ = ("tables",)
+
+    def __init__(self, order=MARKOV_ORDER, my_order=MARKOV_MY_ORDER,
+                 max_patterns=MARKOV_MAX_PATTERNS, eviction="lru"):
+        self.tables = MarkovTables(order, my_order, max_patterns, eviction)
+
+    def state_size(self):
+        # patterns seen so far (dense rows in use plus stored long patterns)
+        tables = self.tables
+        used = tuple(map(bool, tables.opp_totals)).count(True)
+        return used + (len(tables.store) if tables.store is not None else 0)
+
+    def stats(self):
+        # pattern store counters; None while every pattern fits the dense tables
+        store = self.tables.store
+        return None if store is None else store.stats()
+
+    def reset(self):
+        self.tables.reset()
+
+    def __call__(self, prev_play):
+        # Reset for new game
+        if not prev_play:
+            self.tables.reset()
+            return 'R'
+
+        self.tables.update(MOVE_CODE[prev_play])
+        mine = COUNTER[self.tables.predict()]
+        self.tables.record_my_move(mine)
+        return MOVES[mine]
+
+    def fast_forward(self, my_moves, opp_moves):
+        if self.tables.store is not None:
+            # eviction order depends on every lookup, so replay round by round
+            self.reset()
+            prev = ""
+            for opp in opp_moves:
+                self(prev)
+                prev = MOVES[opp]
+            return
+        # the opening "R" is never recorded, so our history starts one round late
+        n = len(opp_moves)
+        self.tables.load_history(opp_moves[:max(0, n - 1)], my_moves[1:n])
+
+
+# ---------- Function-style bots (shared instances) ----------
+_easy1 = Easy1Bot()
+_easy2 = Easy2Bot()
+_medium = MediumBot()
+_medium2 = Medium2Bot()
+_random_bot = RandomBot()
+_markov_chain = MarkovChainBot()
+
+
+def easy1(prev_play):
+    return _easy1(prev_play)
+
+
+def easy2(prev_opponent_play):
+    return _easy2(prev_opponent_play)
 
 
 def medium(prev_opponent_play):
-    if prev_opponent_play == '':
-        prev_opponent_play = "R"
-    ideal_response = {'P': 'S', 'R': 'P', 'S': 'R'}
-    return ideal_response[prev_opponent_play]
-
-
-def medium2(prev_opponent_play,
-          opponent_history=[],
-          play_order=[{
-              "RR": 0,
-              "RP": 0,
-              "RS": 0,
-              "PR": 0,
-              "PP": 0,
-              "PS": 0,
-              "SR": 0,
-              "SP": 0,
-              "SS": 0,
-          }]):
-
-    if not prev_opponent_play:
-        prev_opponent_play = 'R'
-    opponent_history.append(prev_opponent_play)
-
-    last_two = "".join(opponent_history[-2:])
-    if len(last_two) == 2:
-        play_order[0][last_two] += 1
-
-    potential_plays = [
-        prev_opponent_play + "R",
-        prev_opponent_play + "P",
-        prev_opponent_play + "S",
-    ]
-
-    sub_order = {
-        k: play_order[0][k]
-        for k in potential_plays if k in play_order[0]
-    }
-
-    prediction = max(sub_order, key=sub_order.get)[-1:]
-
-    ideal_response = {'P': 'S', 'R': 'P', 'S': 'R'}
-    return ideal_response[prediction]
+    return _medium(prev_opponent_play)
+
+
+def medium2(prev_opponent_play):
+    return _medium2(prev_opponent_play)
 
 
 def human(prev_opponent_play):
@@ -118,57 +572,54 @@ def human(prev_opponent_play):
     return play
 
 
-def random_bot(prev_opponent_play):
-    return random.choice(['R', 'P', 'S'])
-
-def markov_chain(prev_play, opponent_history=[], my_history=[], play_order=[{}]):
-    ideal_response = {'P': 'S', 'R': 'P', 'S': 'R'}
-
-    # Reset for new game
-    if not prev_play:
-        opponent_history.clear()
-        my_history.clear()
-        play_order.clear()
-        play_order.append({})
-        return 'R'
-
-    opponent_history.append(prev_play)
-    records = play_order[0]
-
-    # Update opponent-only Markov chain
-    opp_len = len(opponent_history)
-    for i in range(1, min(6, opp_len)):
-        pattern = "".join(opponent_history[-i-1:-1])
-        rec = records.setdefault(pattern, {'R': 0, 'P': 0, 'S': 0})
-        rec[prev_play] += 1
-
-    # Update combined pattern chain
-    my_len = len(my_history)
-    for i in range(1, min(3, my_len + 1)):
-        if opp_len > i:
-            combined = "".join(my_history[-i:]) + "|" + "".join(opponent_history[-i-1:-1])
-            rec = records.setdefault(combined, {'R': 0, 'P': 0, 'S': 0})
-            rec[prev_play] += 1
-
-    prediction = 'R'             
-    best_prediction, best_confidence = None, 0
-    for length in range(min(5, opp_len), 0, -1):
-        pattern = "".join(opponent_history[-length:])
-        if pattern in records:
-            counts = records[pattern]
-            total = sum(counts.values())
-            if total:
-                pred = max(counts, key=counts.get)
-                confidence = counts[pred] / total
-                if confidence > best_confidence:
-                    best_confidence, best_prediction = confidence, pred
+human.interactive = True  # resultcache never caches its matches
 
-    if best_prediction:
-        prediction = best_prediction
-    elif opp_len >= 3:
-        recent = opponent_history[-5:]
-        prediction = max(('R', 'P', 'S'), key=recent.count)
 
-    my_play = ideal_response[prediction]
-    my_history.append(my_play)
-    return my_play
\ No newline at end of file
+def random_bot(prev_opponent_play):
+    return _random_bot(prev_opponent_play)
+
+
+def markov_chain(prev_play):
+    return _markov_chain(prev_play)
+
+
+_SHARED_BOTS = {
+    easy1: _easy1,
+    easy2: _easy2,
+    medium: _medium,
+    medium2: _medium2,
+    random_bot: _random_bot,
+    markov_chain: _markov_chain,
+}
+
+
+def bot_for(player):
+    # the Bot object behind a function-style bot, or the player itself
+    return _SHARED_BOTS.get(player, player)
+
+
+# ---------- Seeding ----------
+# A match seed gives each side its own RNG stream, so a match replays
+# identically no matter what else is using the random module.
+def player_rng(seed, player):
+    return random.Random(f"{seed}:{player}")
+
+
+# Returns the players the engine should call. The shared function-style
+# bots are swapped for fresh instances (as is player2 when both sides are
+# the same object), so seeding never touches state other callers see and
+# each side always has a stream of its own.
+def seed_players(seed, player1, player2):
+    seeded = []
+    for tag, player in (("p1", player1), ("p2", player2)):
+        bot = bot_for(player)
+        if bot is not player:
+            player = bot = type(bot)()
+        elif seeded and player is player1:
+            player = bot = copy.deepcopy(player)
+        if hasattr(bot, "reset"):
+            bot.reset()
+        if hasattr(bot, "rng"):
+            bot.rng = player_rng(seed, tag)
+        seeded.append(player)
+    return seeded
@@ -0,0 +1,203 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import RPS_game
+import registry
+
+MATCH_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_THRESHOLD = 0.10
+
+
+# ---------- Match engines under test ----------
+# Each entry returns a callable play(bot1, bot2, rounds); engines whose
+# module can't be imported here (e.g. no GUI toolkit) are skipped.
+def _rps_game_play():
+    def run(bot1, bot2, rounds):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return RPS_game.play(bot1, bot2, rounds)
+    return run
+
+
+def _main_play():
+    import main
+    return lambda bot1, bot2, rounds: main.play(bot1, bot2, rounds, delay=0)
+
+
+def _graph_play_games():
+    import graph
+    return graph.play_games
+
+
+def _vector_play():
+    import vector_engine
+    return vector_engine.play
+
+
+ENGINES = {
+    "RPS_game.play": _rps_game_play,
+    "main.play": _main_play,
+    "graph.play_games": _graph_play_games,
+    "vector_engine.play": _vector_play,
+}
+
+
+def _match_bots(seed):
+    return RPS_game.MarkovChainBot(), RPS_game.RandomBot(random.Random(seed))
+
+
+# ---------- Measurements ----------
+def bot_throughput(moves=100_000, repeat=3, seed=0):
+    rng = random.Random(seed)
+    opponent = [rng.choice("RPS") for _ in range(moves)]
+    out = {}
+    for name in registry.keys():
+        best = float("inf")
+        for _ in range(repeat):
+            bot = registry.make(name)
+            bot("")
+            start = time.perf_counter()
+            for prev in opponent:
+                bot(prev)
+            best = min(best, time.perf_counter() - start)
+        out[f"bot/{name}"] = _metric(moves / best, "moves/s")
+    return out
+
+
+def match_throughput(sizes=MATCH_SIZES, repeat=3, seed=0, engines=None):
+    out = {}
+    for engine, loader in engines or load_engines():
+        for rounds in sizes:
+            best = float("inf")
+            for _ in range(repeat):
+                bot1, bot2 = _match_bots(seed)
+                start = time.perf_counter()
+                loader(bot1, bot2, rounds)
+                best = min(best, time.perf_counter() - start)
+            out[f"match/{engine}/{rounds}"] = _metric(rounds / best, "rounds/s")
+    return out
+
+
+def match_memory(sizes=MATCH_SIZES, seed=0, engines=None):
+    out = {}
+    for engine, loader in engines or load_engines():
+        for rounds in sizes:
+            bot1, bot2 = _match_bots(seed)
+            tracemalloc.start()
+            loader(bot1, bot2, rounds)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            out[f"memory/{engine}/{rounds}"] = _metric(peak, "bytes", higher_is_better=False)
+    return out
+
+
+def load_engines():
+    engines = []
+    for name, factory in ENGINES.items():
+        try:
+            engines.append((name, factory()))
+        except ImportError as e:
+            print(f"skipping {name}: {e}", file=sys.stderr)
+    return engines
+
+
+def _metric(value, unit, higher_is_better=True):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def run_all(sizes=MATCH_SIZES, moves=100_000, repeat=3, memory=True):
+    engines = load_engines()
+    results = {}
+    results.update(bot_throughput(moves, repeat))
+    results.update(match_throughput(sizes, repeat, engines=engines))
+    if memory:
+        results.update(match_memory(sizes, engines=engines))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+# ---------- Baselines ----------
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    # a metric regresses when it is worse than the baseline by more than threshold
+    regressions = []
+    rows = []
+    for name, base in baseline["results"].items():
+        now = current["results"].get(name)
+        if now is None:
+            continue
+        change = (now["value"] - base["value"]) / base["value"] if base["value"] else 0.0
+        worse = -change if base["higher_is_better"] else change
+        regressed = worse > threshold
+        rows.append((name, base["value"], now["value"], change, regressed))
+        if regressed:
+            regressions.append(name)
+    return rows, regressions
+
+
+def print_results(report, out=sys.stdout):
+    for name, m in report["results"].items():
+        out.write(f"{name:<40} {m['value']:>16,.0f} {m['unit']}\n")
+
+
+def print_comparison(rows, out=sys.stdout):
+    for name, base, now, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        out.write(f"{name:<40} {base:>16,.0f} -> {now:>16,.0f}  {change:+7.1%}{flag}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark bots and match engines.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="run the suite and optionally save a baseline")
+    cmp_p = sub.add_parser("compare", help="compare against a saved baseline")
+    cmp_p.add_argument("baseline", help="baseline JSON file")
+    cmp_p.add_argument("current", nargs="?", help="results JSON to compare (default: run now)")
+    cmp_p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help="allowed relative slowdown before flagging (default 0.10)")
+    for p in (run_p, cmp_p):
+        p.add_argument("--sizes", type=int, nargs="+", default=list(MATCH_SIZES))
+        p.add_argument("--moves", type=int, default=100_000, help="moves per bot throughput run")
+        p.add_argument("--repeat", type=int, default=3)
+        p.add_argument("--no-memory", action="store_true", help="skip peak-memory runs")
+        p.add_argument("--out", help="write results JSON here")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare" and args.current:
+        with open(args.current) as f:
+            report = json.load(f)
+    else:
+        report = run_all(args.sizes, args.moves, args.repeat, not args.no_memory)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.command == "run":
+        print_results(report)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows, regressions = compare(baseline, report, args.threshold)
+    print_comparison(rows)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
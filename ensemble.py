@@ -0,0 +1,228 @@
+import numpy as np
+
+from RPS_game import _SHARED_BOTS, MarkovTables, RollingCounter
+from rules import COUNTER, MOVE_CODE, MOVES, OUTCOME, P1_WIN, P2_WIN
+
+# ---------- Ensemble meta-bot ----------
+# Iocaine Powder style: a pool of simple predictors each guess the
+# opponent's next move, every guess is also tried rotated by one and two
+# ("they know that I know..."), and the bot follows whichever variant has
+# scored best recently. Predictors run on the opponent's history and on our
+# own (assuming the opponent will beat what we usually play next).
+#
+# Every predictor keeps bounded state, so a move costs the same on round
+# ten as on round ten million. Moves depend only on the history (and the
+# lite setting), never on timing, so seeded matches replay exactly.
+ENSEMBLE_MARKOV_ORDER = 6
+ENSEMBLE_MATCH_LENGTH = 8   # longest pattern the history matchers look for
+ENSEMBLE_PAIR_LENGTH = 4    # same, for the combined (opp, mine) history
+ENSEMBLE_WINDOW = 20        # recent-frequency window
+ENSEMBLE_DECAY = 0.9        # weight of a score after one more round
+ENSEMBLE_REPLAY_ROUNDS = 1000  # rounds fast_forward rescores one at a time
+
+# SCORE[ours, theirs]: +1 win, 0 tie, -1 loss
+SCORE = np.array([[{P1_WIN: 1, P2_WIN: -1}.get(result, 0) for result in row] for row in OUTCOME],
+                 dtype=np.float64)
+# _GAIN[theirs][guess]: score of playing what beats `guess` against `theirs`
+_GAIN = SCORE[list(COUNTER)].T.copy()
+_ROTATIONS = np.arange(3)
+
+
+class HistoryMatcher:
+    # What followed the last time the current pattern of the last k symbols
+    # appeared, for the longest k that has appeared before. One dict per k,
+    # each bounded by alphabet**k entries.
+    __slots__ = ("base", "length", "mods", "codes", "seen", "next_after")
+
+    def __init__(self, base, length):
+        self.base = base
+        self.length = length
+        self.mods = [base ** k for k in range(1, length + 1)]
+        self.codes = [0] * length
+        self.seen = 0
+        self.next_after = [{} for _ in range(length)]
+
+    def update(self, symbol):
+        for k in range(min(self.length, self.seen)):
+            self.next_after[k][self.codes[k]] = symbol
+        self.codes = [(c * self.base + symbol) % mod for c, mod in zip(self.codes, self.mods)]
+        self.seen += 1
+
+    def load(self, symbols):
+        # batch update() over a whole sequence (an int64 array)
+        n = len(symbols)
+        self.next_after = []
+        for k in range(self.length):
+            length = k + 1
+            table = {}
+            if n > length:
+                code = np.zeros(n - length, dtype=np.int64)
+                for j in range(length):
+                    code = code * self.base + symbols[j:n - length + j]
+                # the successor of each pattern's last occurrence wins
+                last = np.full(self.mods[k], -1, dtype=np.int64)
+                np.maximum.at(last, code, np.arange(n - length))
+                patterns = np.flatnonzero(last >= 0)
+                table = dict(zip(patterns.tolist(), symbols[length:][last[patterns]].tolist()))
+            self.next_after.append(table)
+        self.codes = [0] * self.length
+        for symbol in symbols[-self.length:].tolist():
+            self.codes = [(c * self.base + symbol) % mod for c, mod in zip(self.codes, self.mods)]
+        self.seen = n
+
+    def predict(self, default):
+        for k in range(min(self.length, self.seen) - 1, -1, -1):
+            symbol = self.next_after[k].get(self.codes[k])
+            if symbol is not None:
+                return symbol
+        return default
+
+
+class _Side:
+    # the predictors that read one move sequence (theirs or ours)
+    __slots__ = ("counts", "recent", "markov", "matcher", "last")
+
+    def __init__(self):
+        self.counts = [0, 0, 0]
+        self.recent = RollingCounter(ENSEMBLE_WINDOW, (0, 1, 2))
+        self.markov = MarkovTables(ENSEMBLE_MARKOV_ORDER, 0)
+        self.matcher = HistoryMatcher(3, ENSEMBLE_MATCH_LENGTH)
+        self.last = 0
+
+    def update(self, move):
+        self.counts[move] += 1
+        self.recent.push(move)
+        self.markov.update(move)
+        self.matcher.update(move)
+        self.last = move
+
+    def load(self, moves):
+        # batch update() over a whole history (an int64 array, not empty)
+        self.counts = np.bincount(moves, minlength=3).tolist()
+        self.recent.clear()
+        for move in moves[-ENSEMBLE_WINDOW:].tolist():
+            self.recent.push(move)
+        self.markov.load_history(moves, moves)
+        self.matcher.load(moves)
+        self.last = int(moves[-1])
+
+    def predict(self, out):
+        counts = self.counts
+        frequent = counts.index(max(counts))
+        out.append(frequent)
+        out.append(self.recent.most_common())
+        out.append(self.last)
+        out.append(self.matcher.predict(frequent))
+
+        tables = self.markov
+        for k in range(ENSEMBLE_MARKOV_ORDER):
+            row = tables.opp_offsets[k] + tables.opp_codes[k]
+            if k < tables.opp_len and tables.opp_totals[row]:
+                out.append(tables.opp_best[row])
+            else:
+                out.append(frequent)
+
+
+class EnsembleBot:
+    # lite=True runs only the predictors on the opponent's history: about
+    # half the cost per move, for somewhat weaker play.
+    __slots__ = ("lite", "theirs", "mine", "pairs", "shift", "scores", "predictions", "my_last")
+
+    def __init__(self, lite=False):
+        self.lite = lite
+        self.reset()
+
+    def reset(self):
+        self.theirs = _Side()
+        self.mine = _Side()
+        self.pairs = HistoryMatcher(9, ENSEMBLE_PAIR_LENGTH)
+        self.shift = None
+        self.scores = None
+        self.predictions = None
+        self.my_last = 0
+
+    def _base_predictions(self):
+        # predicted opponent moves, one per predictor
+        theirs = []
+        self.theirs.predict(theirs)
+        if self.lite:
+            return np.array(theirs, dtype=np.int64)
+
+        mine = []
+        self.mine.predict(mine)
+        pair = self.pairs.predict(-1)
+        base = np.array(theirs + mine + [pair // 3 if pair >= 0 else theirs[0]], dtype=np.int64)
+        if self.shift is None:
+            # a guess at our own next move means they play what beats it
+            self.shift = np.zeros(len(base), dtype=np.int64)
+            self.shift[len(theirs):len(theirs) + len(mine)] = 1
+        base += self.shift
+        return base
+
+    def _predict(self):
+        base = self._base_predictions()
+        self.predictions = ((base[:, None] + _ROTATIONS) % 3).ravel()
+        if self.scores is None:
+            self.scores = np.zeros(len(self.predictions))
+
+    def _observe(self, move):
+        # score last round's variants against the opponent's move, then
+        # update the predictors with the round and predict again
+        if self.predictions is not None:
+            # every variant is scored as if we had played what beats its guess
+            self.scores *= ENSEMBLE_DECAY
+            self.scores += _GAIN[move][self.predictions]
+
+        self.theirs.update(move)
+        if not self.lite:
+            self.mine.update(self.my_last)
+            self.pairs.update(move * 3 + self.my_last)
+        self._predict()
+
+    def __call__(self, prev_opponent_play):
+        if not prev_opponent_play:
+            self.reset()
+            return "R"
+
+        self._observe(MOVE_CODE[prev_opponent_play])
+        guess = int(self.predictions[int(np.argmax(self.scores))])
+        self.my_last = COUNTER[guess]
+        return MOVES[self.my_last]
+
+    def fast_forward(self, my_moves, opp_moves):
+        # The predictors are rebuilt from the whole history in one batch.
+        # Only the variant scores need rounds one at a time, and a round's
+        # weight shrinks by ENSEMBLE_DECAY per round after it, so rounds more
+        # than ENSEMBLE_REPLAY_ROUNDS back are far below float precision:
+        # the last rounds are rescored from zero with the recorded moves.
+        self.reset()
+        n = len(opp_moves)
+        if not n:
+            return
+        opp = np.asarray(opp_moves, dtype=np.int64)
+        mine = np.asarray(my_moves, dtype=np.int64)
+
+        # call i (i >= 1) saw opp[i - 1] and answered mine[i]
+        batch = max(0, n - 1 - ENSEMBLE_REPLAY_ROUNDS)
+        if batch:
+            self.theirs.load(opp[:batch])
+            if not self.lite:
+                self.mine.load(mine[:batch])
+                self.pairs.load(opp[:batch] * 3 + mine[:batch])
+            self._predict()
+        self.my_last = int(mine[batch])
+        for i in range(batch + 1, n):
+            self._observe(int(opp[i - 1]))
+            self.my_last = int(mine[i])
+
+
+# ---------- Function-style bot (shared instance) ----------
+_ensemble = EnsembleBot()
+
+
+def ensemble(prev_opponent_play):
+    return _ensemble(prev_opponent_play)
+
+
+# RPS_game can't import this module, so the wrapper registers itself
+_SHARED_BOTS[ensemble] = _ensemble
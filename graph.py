@@ -1,59 +1,127 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-import random as rand
-from RPS_game import easy1, easy2, medium, medium2, markov_chain
-
-def random_bot(prev_play):
-    return rand.choice(['R', 'P', 'S'])
-
-bots = {
-    "Easy 1": easy1,
-    "Easy 2": easy2,
-    "Medium 1": medium,
-    "Medium 2": medium2,
-    "Hard (Markov Chain)": markov_chain,
-    "Random Bot": random_bot
-}
-
-def winner_of(p1, p2):
-    if p1 == p2:
-        return "tie"
-    wins = {("P", "R"), ("R", "S"), ("S", "P")}
-    return "p1" if (p1, p2) in wins else "p2"
-
-def play_games(player1, player2, num_games):
+import numpy as np
+
+import registry
+from RPS_game import seed_players
+from rules import MOVE_CODE, OUTCOME, P1_WIN, P2_WIN, RESULT_KEYS, winner_of
+
+# tkinter and matplotlib are imported inside the functions that use them,
+# so headless callers of play_games never pay for loading them.
+
+def play_games(player1, player2, num_games, progress=None, cancel=None, report_every=1000,
+               log=None, seed=None, probe=None, stop=None, cache=None):
+    # progress(rounds_done, results) is called every report_every rounds;
+    # the match stops early once the cancel event is set. Moves are
+    # recorded to log (a matchlog.MatchLogWriter) when one is given, and
+    # a seed resets both players and gives them their own RNG streams.
+    # A latency.LatencyProbe times every bot call, and a sequential test
+    # (sequential.MixtureTest / SPRT) ends the match once it is decided.
+    # Seeded matches with no hooks are looked up in a resultcache.ResultCache.
+    if seed is not None:
+        player1, player2 = seed_players(seed, player1, player2)
+    key = None
+    if cache is not None and seed is not None and progress is None and cancel is None \
+            and log is None and probe is None and stop is None:
+        key = cache.key(__name__, player1, player2, num_games, seed)
+        hit = cache.get(key) if key else None
+        if hit is not None:
+            return hit
+    if probe is not None:
+        player1, player2 = probe.attach(player1, player2)
     p1_prev = p2_prev = ""
     results = {"p1": 0, "p2": 0, "tie": 0}
     history = []
+    hooked = progress is not None or cancel is not None
 
-    for _ in range(num_games):
-        p1_play = player1(p2_prev)
-        p2_play = player2(p1_prev)
+    for i in range(num_games):
+        p1_play = player1(p1_prev)
+        p2_play = player2(p2_prev)
 
-        result = winner_of(p1_play, p2_play)
+        code = OUTCOME[MOVE_CODE[p1_play]][MOVE_CODE[p2_play]]
+        result = RESULT_KEYS[code]
         results[result] += 1
         history.append(result)
+        if log is not None:
+            log.record(p1_play, p2_play)
 
         p1_prev, p2_prev = p2_play, p1_play
+        if probe is not None:
+            probe.end_round()
+        if stop is not None and stop.update(code):
+            break
 
+        if hooked and (i + 1) % report_every == 0:
+            if progress is not None:
+                progress(i + 1, dict(results))
+            if cancel is not None and cancel.is_set():
+                break
+
+    if key:
+        cache.put(key, results, history)
     return results, history
 
 
-def plot_graph(history, name1, name2):
-    p1 = p2 = 0
-    win_p1, win_p2 = [], []
+# ---------- Win-rate curves ----------
+# A chart only has so many pixels, so long matches are reduced to a few
+# points per pixel column before they ever reach matplotlib.
+PLOT_WIDTH_PX = 700
+POINTS_PER_PX = 2
+
+
+def encode_history(history):
+    if isinstance(history, np.ndarray):
+        return history
+    codes = {key: i for i, key in enumerate(RESULT_KEYS)}
+    return np.fromiter((codes[h] for h in history), dtype=np.int8, count=len(history))
+
+
+def win_rate_curves(history):
+    # running win % of each player after every round
+    outcomes = encode_history(history)
+    rounds = np.arange(1, len(outcomes) + 1)
+    win_p1 = 100 * np.cumsum(outcomes == P1_WIN) / rounds
+    win_p2 = 100 * np.cumsum(outcomes == P2_WIN) / rounds
+    return win_p1, win_p2
+
 
-    for i, h in enumerate(history):
-        if h == "p1": p1 += 1
-        elif h == "p2": p2 += 1
-        total = i + 1
-        win_p1.append(100*p1/total)
-        win_p2.append(100*p2/total)
+def downsample_lttb(y, max_points):
+    # Largest-Triangle-Three-Buckets: keeps the points that best preserve
+    # the visual shape of the series. Returns the kept x indices and values.
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return np.arange(n), np.asarray(y)
+
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    keep = np.empty(max_points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(max_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        # average of the next bucket (or the last point) is the third vertex
+        nxt_start, nxt_stop = stop, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = (nxt_start + nxt_stop - 1) / 2
+        avg_y = y[nxt_start:nxt_stop].mean()
+
+        xs = np.arange(start, stop)
+        area = np.abs((a - avg_x) * (y[start:stop] - y[a]) - (a - xs) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return keep, y[keep]
+
+
+def plot_graph(history, name1, name2, max_points=None):
+    import matplotlib.pyplot as plt
+
+    win_p1, win_p2 = win_rate_curves(history)
+    max_points = max_points or PLOT_WIDTH_PX * POINTS_PER_PX
+    x1, y1 = downsample_lttb(win_p1, max_points)
+    x2, y2 = downsample_lttb(win_p2, max_points)
 
     plt.figure(figsize=(7,5))
-    plt.plot(win_p1, label=name1)
-    plt.plot(win_p2, label=name2)
+    plt.plot(x1, y1, label=name1)
+    plt.plot(x2, y2, label=name2)
     plt.xlabel("Rounds")
     plt.ylabel("Win %")
     plt.title("Win Rate Over Time")
@@ -63,10 +131,20 @@ def plot_graph(history, name1, name2):
 
 
 
+POLL_MS = 50
+
+
 def start_gui():
+    import queue
+    import random
+    import threading
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+
+    labels = [spec.label for spec in registry.BOTS]
     root = tk.Tk()
     root.title("Rock Paper Scissors – Bot vs Bot GUI")
-    root.geometry("500x400")
+    root.geometry("500x500")
 
     style = ttk.Style()
     style.configure("TButton", font=("Arial", 12))
@@ -75,20 +153,78 @@ def start_gui():
     bot1_var = tk.StringVar()
     bot2_var = tk.StringVar()
     round_var = tk.StringVar(value="50")
+    score_var = tk.StringVar(value="")
 
     ttk.Label(root, text="Select Bot 1:").pack(pady=10)
-    bot1_box = ttk.Combobox(root, textvariable=bot1_var, values=list(bots.keys()))
+    bot1_box = ttk.Combobox(root, textvariable=bot1_var, values=labels)
     bot1_box.current(0)
     bot1_box.pack()
 
     ttk.Label(root, text="Select Bot 2:").pack(pady=10)
-    bot2_box = ttk.Combobox(root, textvariable=bot2_var, values=list(bots.keys()))
+    bot2_box = ttk.Combobox(root, textvariable=bot2_var, values=labels)
     bot2_box.current(1)
     bot2_box.pack()
 
     ttk.Label(root, text="Number of Rounds:").pack(pady=10)
     ttk.Entry(root, textvariable=round_var).pack()
 
+    # The match runs on a worker thread and reports back through a queue
+    # that the Tk loop drains with after(), so the window never blocks.
+    events = queue.Queue()
+    cancel = threading.Event()
+    current = {}
+
+    def worker(bot1, bot2, rounds, seed):
+        def progress(done, results):
+            events.put(("progress", done, results))
+
+        report_every = max(1, rounds // 200)
+        try:
+            results, history = play_games(bot1, bot2, rounds, progress=progress,
+                                          cancel=cancel, report_every=report_every, seed=seed)
+        except Exception as e:
+            # poll must always get a final event, or the buttons stay disabled
+            events.put(("error", f"{type(e).__name__}: {e}"))
+            return
+        events.put(("done", len(history), results, history))
+
+    def show_score(done, results):
+        progress_bar["value"] = done
+        score_var.set(f"Round {done}/{current['rounds']}   "
+                      f"{current['name1']}: {results['p1']}   "
+                      f"{current['name2']}: {results['p2']}   Ties: {results['tie']}")
+
+    def poll():
+        finished = None
+        try:
+            while True:
+                event = events.get_nowait()
+                if event[0] == "progress":
+                    show_score(event[1], event[2])
+                else:
+                    finished = event
+        except queue.Empty:
+            pass
+
+        if finished is None:
+            root.after(POLL_MS, poll)
+            return
+
+        run_button.state(["!disabled"])
+        cancel_button.state(["disabled"])
+        if finished[0] == "error":
+            messagebox.showerror("Match failed", finished[1])
+            return
+
+        _, done, results, history = finished
+        show_score(done, results)
+        name1, name2 = current["name1"], current["name2"]
+        title = "Results" if done == current["rounds"] else f"Cancelled after {done} rounds"
+        messagebox.showinfo(title, f"{name1} Wins: {results['p1']}\n{name2} Wins: {results['p2']}\nTies: {results['tie']}"
+                                   f"\nSeed: {current['seed']}")
+        if history:
+            plot_graph(history, name1, name2)
+
     def run_match():
         name1, name2 = bot1_var.get(), bot2_var.get()
 
@@ -102,15 +238,30 @@ def start_gui():
             messagebox.showerror("Error", "Invalid round number.")
             return
 
-        bot1 = bots[name1]
-        bot2 = bots[name2]
+        # fresh bots so a match never shares state with an earlier one
+        bot1 = registry.make(registry.by_label(name1).key)
+        bot2 = registry.make(registry.by_label(name2).key)
+
+        seed = random.SystemRandom().getrandbits(32)
+        current.update(name1=name1, name2=name2, rounds=rounds, seed=seed)
+        cancel.clear()
+        progress_bar["maximum"] = max(1, rounds)
+        show_score(0, {"p1": 0, "p2": 0, "tie": 0})
+        run_button.state(["disabled"])
+        cancel_button.state(["!disabled"])
 
-        results, history = play_games(bot1, bot2, rounds)
+        threading.Thread(target=worker, args=(bot1, bot2, rounds, seed), daemon=True).start()
+        root.after(POLL_MS, poll)
 
-        messagebox.showinfo("Results", f"{name1} Wins: {results['p1']}\n{name2} Wins: {results['p2']}\nTies: {results['tie']}")
-        plot_graph(history, name1, name2)
+    run_button = ttk.Button(root, text="Run Match", command=run_match)
+    run_button.pack(pady=(20, 5))
+    cancel_button = ttk.Button(root, text="Cancel", command=cancel.set)
+    cancel_button.state(["disabled"])
+    cancel_button.pack()
 
-    ttk.Button(root, text="Run Match", command=run_match).pack(pady=20)
+    progress_bar = ttk.Progressbar(root, length=400, mode="determinate")
+    progress_bar.pack(pady=10)
+    ttk.Label(root, textvariable=score_var).pack()
 
     root.mainloop()
 
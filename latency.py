@@ -0,0 +1,152 @@
+import json
+import time
+
+from RPS_game import bot_for
+
+# Pass probe=LatencyProbe() to RPS_game.play, main.play or graph.play_games
+# to time every bot call. Without a probe the engines run their plain loop.
+
+# ---------- Histogram ----------
+# Log-linear buckets: each power of two is split into 2**SUB_BITS buckets,
+# so a recorded value is off by at most ~25% and recording is a couple of
+# integer ops and one list increment.
+SUB_BITS = 2
+_SUB = 1 << SUB_BITS
+
+
+def bucket_of(ns):
+    bits = ns.bit_length()
+    if bits <= SUB_BITS + 1:
+        return ns
+    shift = bits - SUB_BITS - 1
+    return (shift << SUB_BITS) + (ns >> shift)
+
+
+_BUCKETS = bucket_of((1 << 64) - 1) + 1
+
+
+def bucket_floor(index):
+    # smallest value that lands in bucket `index`
+    if index < 2 * _SUB:
+        return index
+    shift = (index >> SUB_BITS) - 1
+    return (index - (shift << SUB_BITS)) << shift
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.count = self.total = self.max = 0
+
+    def record(self, ns):
+        self.counts[bucket_of(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, p):
+        # upper edge of the bucket holding the p-th percentile, capped at max
+        if not self.count:
+            return 0
+        rank = max(1, round(p / 100 * self.count))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bucket_floor(index + 1) - 1, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ns": self.total / self.count if self.count else 0.0,
+            "p50_ns": self.percentile(50),
+            "p99_ns": self.percentile(99),
+            "max_ns": self.max,
+        }
+
+    def to_dict(self):
+        out = self.summary()
+        out["buckets"] = {bucket_floor(i): n for i, n in enumerate(self.counts) if n}
+        return out
+
+
+# ---------- Probe ----------
+class LatencyProbe:
+    # Per-player call latency, per-round engine overhead (round time minus
+    # time spent inside the bots) and, every sample_every rounds, the state
+    # size of bots that report one (MarkovChainBot.state_size()).
+    def __init__(self, names=("p1", "p2"), sample_every=1000):
+        self.names = names
+        self.sample_every = sample_every
+        self.players = {"p1": LatencyHistogram(), "p2": LatencyHistogram()}
+        self.engine = LatencyHistogram()
+        self.state = {"p1": [], "p2": []}
+        self.rounds = 0
+        self._bots = {}
+        self._bot_ns = 0
+        self._round_start = 0
+
+    def attach(self, player1, player2):
+        # returns timed wrappers for the engine to call in place of the players
+        self._bots = {"p1": bot_for(player1), "p2": bot_for(player2)}
+        wrapped = self._timed(player1, self.players["p1"]), self._timed(player2, self.players["p2"])
+        self._round_start = time.perf_counter_ns()
+        return wrapped
+
+    def _timed(self, player, histogram):
+        clock = time.perf_counter_ns
+        record = histogram.record
+
+        def timed(prev):
+            start = clock()
+            move = player(prev)
+            elapsed = clock() - start
+            record(elapsed)
+            self._bot_ns += elapsed
+            return move
+        return timed
+
+    def end_round(self):
+        now = time.perf_counter_ns()
+        self.engine.record(max(0, now - self._round_start - self._bot_ns))
+        self._bot_ns = 0
+        self.rounds += 1
+        if self.rounds % self.sample_every == 0:
+            self._sample()
+        self._round_start = time.perf_counter_ns()
+
+    def _sample(self):
+        for tag, bot in self._bots.items():
+            size = getattr(bot, "state_size", None)
+            if size is not None:
+                self.state[tag].append((self.rounds, size()))
+
+    def to_dict(self):
+        return {
+            "rounds": self.rounds,
+            "players": {tag: dict(name=name, **self.players[tag].to_dict())
+                        for tag, name in zip(("p1", "p2"), self.names)},
+            "engine": self.engine.to_dict(),
+            "state_size": {tag: samples for tag, samples in self.state.items() if samples},
+        }
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def report(self):
+        lines = [f"{'':<24}{'calls':>10}{'p50 us':>10}{'p99 us':>10}{'max us':>10}"]
+        rows = [(name, self.players[tag]) for tag, name in zip(("p1", "p2"), self.names)]
+        rows.append(("engine overhead", self.engine))
+        for name, h in rows:
+            lines.append(f"{name:<24}{h.count:>10}{h.percentile(50) / 1e3:>10.2f}"
+                         f"{h.percentile(99) / 1e3:>10.2f}{h.max / 1e3:>10.2f}")
+        for tag, samples in self.state.items():
+            if samples:
+                lines.append(f"{tag} state size: {samples[0][1]} -> {samples[-1][1]} "
+                             f"(rounds {samples[0][0]}-{samples[-1][0]})")
+        return "\n".join(lines)
@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from server import DEFAULT_PORT
+
+# Opens many human-vs-bot sessions against server.py at once and reports
+# sessions/sec and per-move round-trip latency.
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+
+async def run_session(host, port, bot, moves, rng, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        async def call(request):
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            reply = json.loads(await reader.readline())
+            if "error" in reply:
+                raise RuntimeError(reply["error"])
+            return reply
+
+        await call({"op": "start", "bot2": bot, "seed": rng.getrandbits(32)})
+        for _ in range(moves):
+            start = time.perf_counter()
+            await call({"op": "move", "move": rng.choice("RPS")})
+            latencies.append(time.perf_counter() - start)
+        await call({"op": "quit"})
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, sessions, concurrency, moves, bot, seed):
+    rng = random.Random(seed)
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = []
+
+    async def one():
+        async with gate:
+            try:
+                await run_session(host, port, bot, moves, random.Random(rng.getrandbits(64)), latencies)
+            except (OSError, RuntimeError, ValueError) as e:
+                errors.append(str(e))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+    return elapsed, sorted(latencies), errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the match server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=200, help="sessions open at once")
+    parser.add_argument("--moves", type=int, default=20, help="moves per session")
+    parser.add_argument("--bot", default="markov_chain")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    elapsed, latencies, errors = asyncio.run(
+        run_load(args.host, args.port, args.sessions, args.concurrency, args.moves, args.bot, args.seed))
+
+    done = args.sessions - len(errors)
+    print(f"{done} sessions in {elapsed:.2f}s ({done / elapsed:,.0f} sessions/s, "
+          f"{len(latencies) / elapsed:,.0f} moves/s)")
+    print(f"move latency ms: p50 {percentile(latencies, 50) * 1e3:.2f}  "
+          f"p99 {percentile(latencies, 99) * 1e3:.2f}  max {percentile(latencies, 100) * 1e3:.2f}")
+    if errors:
+        print(f"{len(errors)} failed sessions, first: {errors[0]}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,14 @@
-from RPS_game import easy1, easy2, medium, medium2, markov_chain, human, random_bot
-import time
+import argparse
+import io
+import json
 import os
-from graph import plot_graph
+import random
+import sys
+import time
+
+import registry
+from RPS_game import seed_players
+from rules import MOVE_CODE, MOVE_NAMES, OUTCOME, RESULT_KEYS, winner_of
 
 GREEN = "\033[92m"
 RED = "\033[91m"
@@ -9,7 +16,7 @@ CYAN = "\033[96m"
 YELLOW = "\033[93m"
 RESET = "\033[0m"
 
-moves_ = {"R": "Rock", "P": "Paper", "S": "Scissors"}
+moves_ = dict(zip("RPS", MOVE_NAMES))
 
 def clear():
     os.system("cls" if os.name == "nt" else "clear")
@@ -37,23 +44,33 @@ def get_user_move():
 def human_player(prev):
     return get_user_move()
 
-# Result Computation
+human_player.interactive = True  # resultcache never caches its matches
 
-def winner_of(p1, p2):
-    if p1 == p2:
-        return "tie"
-
-    wins = {
-        ("P", "R"),
-        ("R", "S"),
-        ("S", "P"),
-    }
-
-    return "p1" if (p1, p2) in wins else "p2"
+# Result Computation: rules.winner_of, one table lookup per round
 
 # PLAY Function
 
-def play(player1, player2, num_games, names=("You", "Bot"), verbose=False):
+def paint(text, code, color=True):
+    return code + text + RESET if color else text
+
+
+def play(player1, player2, num_games, names=("You", "Bot"), verbose=False, delay=0.4,
+         out=None, color=True, log=None, seed=None, probe=None, stop=None, cache=None):
+    # with a seed both players are reset and get their own RNG streams,
+    # so the same seed always replays the same match
+    if seed is not None:
+        player1, player2 = seed_players(seed, player1, player2)
+    key = None
+    if cache is not None and seed is not None and not verbose and log is None \
+            and probe is None and stop is None:
+        # resultcache.ResultCache: seeded matches are only played once
+        key = cache.key(__name__, player1, player2, num_games, seed)
+        hit = cache.get(key) if key else None
+        if hit is not None:
+            return hit
+    if probe is not None:
+        # latency.LatencyProbe: times every bot call
+        player1, player2 = probe.attach(player1, player2)
     p1_prev = p2_prev = ""
     results = {"p1": 0, "p2": 0, "tie": 0}
     history = []
@@ -62,55 +79,55 @@ def play(player1, player2, num_games, names=("You", "Bot"), verbose=False):
         p1_play = player1(p1_prev)
         p2_play = player2(p2_prev)
 
-        result = winner_of(p1_play, p2_play)
+        code = OUTCOME[MOVE_CODE[p1_play]][MOVE_CODE[p2_play]]
+        result = RESULT_KEYS[code]
         results[result] += 1
         history.append(result)
+        if log is not None:
+            log.record(p1_play, p2_play)
 
         if verbose:
-            print(f"\nRound {_ + 1}:")
-            print(f"{names[0]}: {moves_[p1_play]}  |  {names[1]}: {moves_[p2_play]}")
+            print(f"\nRound {_ + 1}:", file=out)
+            print(f"{names[0]}: {moves_[p1_play]}  |  {names[1]}: {moves_[p2_play]}", file=out)
 
             if result == "tie":
-                print(YELLOW + "It's a Tie!" + RESET)
+                print(paint("It's a Tie!", YELLOW, color), file=out)
             elif result == "p1":
-                print(GREEN + f"{names[0]} Wins!" + RESET)
+                print(paint(f"{names[0]} Wins!", GREEN, color), file=out)
             else:
-                print(RED + f"{names[1]} Wins!" + RESET)
+                print(paint(f"{names[1]} Wins!", RED, color), file=out)
         
         p1_prev, p2_prev = p2_play, p1_play
-        time.sleep(0.4)
+        if probe is not None:
+            probe.end_round()
+        if stop is not None and stop.update(code):
+            # sequential.MixtureTest / SPRT: the winner is settled
+            break
+        if delay:
+            time.sleep(delay)
+    if key:
+        cache.put(key, results, history)
     return results, history
 
 
 # Bot Selection
 def select_bot(prompt="Select Bot:"):
     print(CYAN + f"{prompt}" + RESET)
-    print("""
- 1. Easy 1
- 2. Easy 2
- 3. Medium 1
- 4. Medium 2
- 5. Hard (Markov Chain)
- 6. Random Bot
-""")
+    print()
+    for i, spec in enumerate(registry.BOTS, start=1):
+        print(f" {i}. {spec.label}")
+    print()
 
-    bots = {
-        "1": easy1,
-        "2": easy2,
-        "3": medium,
-        "4": medium2,
-        "5": markov_chain,
-        "6": random_bot
-    }
+    bots = {str(i): spec.key for i, spec in enumerate(registry.BOTS, start=1)}
 
-    choice = input("Enter choice (1-6): ").strip()
+    choice = input(f"Enter choice (1-{len(bots)}): ").strip()
 
     if choice not in bots:
         print(RED + "Invalid option. Try again.\n" + RESET)
         return select_bot(prompt)
 
     print(GREEN + "Bot Selected Successfully!\n" + RESET)
-    return bots[choice], f"Bot-{choice}"
+    return registry.get(bots[choice]), f"Bot-{choice}"
 
 # -------------------------
 def main():
@@ -166,6 +183,7 @@ def main():
             print(YELLOW + "It's a tie!" + RESET)
 
         # Plot graph after results
+        from graph import plot_graph
         if mode == "2":  # Only for Bot vs Bot
             plot_graph(history, name1, name2)
         elif mode == "1":  # For Human vs Bot, use bot_name
@@ -180,5 +198,113 @@ def main():
     print(GREEN + "\nThanks for playing!" + RESET)
 
 
+# -------------------------
+# Headless batch mode: no prompts, sleeps or screen clears, and all output
+# goes out in a single write at the end.
+def headless(argv=None):
+    parser = argparse.ArgumentParser(description="Run a bot vs bot match without the interactive menus.")
+    parser.add_argument("--bot1", required=True, choices=registry.keys())
+    parser.add_argument("--bot2", required=True, choices=registry.keys())
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    parser.add_argument("--verbose", action="store_true", help="include every round in text output")
+    parser.add_argument("--history", action="store_true", help="include the round history in JSON output")
+    parser.add_argument("--log", metavar="PATH", help="record both players' moves to a binary match log")
+    parser.add_argument("--latency", metavar="PATH", help="time every bot call and write the histograms as JSON")
+    parser.add_argument("--early-stop", type=float, metavar="ALPHA",
+                        help="stop once a sequential test settles the winner at this error rate")
+    parser.add_argument("--test", choices=("mixture", "sprt"), default="mixture",
+                        help="sequential test for --early-stop (default: mixture)")
+    parser.add_argument("--delta", type=float, default=0.05,
+                        help="SPRT: smallest win-rate edge over 50%% worth detecting")
+    parser.add_argument("--cache", nargs="?", const="", metavar="DIR",
+                        help="reuse results of identical earlier matches (default dir: .rps_cache)")
+    args = parser.parse_args(argv)
+
+    stop = None
+    if args.early_stop is not None:
+        from sequential import SPRT, MixtureTest
+        try:
+            stop = SPRT(args.early_stop, args.delta) if args.test == "sprt" else MixtureTest(args.early_stop)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.seed is None:
+        args.seed = random.SystemRandom().getrandbits(32)
+    bot1, bot2 = registry.make(args.bot1), registry.make(args.bot2)
+    names = (registry.spec(args.bot1).label, registry.spec(args.bot2).label)
+
+    log = None
+    if args.log:
+        from matchlog import MatchLogWriter
+        log = MatchLogWriter(args.log, (args.bot1, args.bot2), seed=args.seed)
+
+    probe = None
+    if args.latency:
+        from latency import LatencyProbe
+        probe = LatencyProbe(names)
+
+    cache = None
+    if args.cache is not None:
+        from resultcache import DEFAULT_DIR, ResultCache
+        cache = ResultCache(args.cache or DEFAULT_DIR)
+
+    buf = io.StringIO()
+    start = time.perf_counter()
+    try:
+        results, history = play(bot1, bot2, args.rounds, names=names,
+                                verbose=args.verbose and args.format == "text",
+                                delay=0, out=buf, color=False, log=log, seed=args.seed, probe=probe,
+                                stop=stop, cache=cache)
+    finally:
+        # an interrupted run still leaves a readable log of the rounds so far
+        if log is not None:
+            log.close()
+    elapsed = time.perf_counter() - start
+    if probe is not None:
+        probe.dump(args.latency)
+
+    decided = results["p1"] + results["p2"]
+    summary = {
+        "bot1": args.bot1,
+        "bot2": args.bot2,
+        "rounds": len(history),
+        "seed": args.seed,
+        "results": results,
+        "p1_win_rate": results["p1"] / decided * 100 if decided else 0.0,
+        "elapsed_sec": elapsed,
+    }
+    if stop is not None:
+        summary["early_stop"] = stop.report(args.rounds)
+    if cache is not None:
+        summary["cache"] = cache.stats()
+
+    if args.format == "json":
+        if args.history:
+            summary["history"] = history
+        buf.write(json.dumps(summary) + "\n")
+    else:
+        buf.write(f"\n{names[0]} vs {names[1]} ({len(history)} rounds, seed {args.seed})\n")
+        buf.write(f"P1 Wins: {results['p1']}\n")
+        buf.write(f"P2 Wins: {results['p2']}\n")
+        buf.write(f"Ties: {results['tie']}\n")
+        buf.write(f"Player 1 win rate: {summary['p1_win_rate']:.2f}%\n")
+        if stop is not None:
+            report = summary["early_stop"]
+            verdict = {"p1": names[0] + " is better", "p2": names[1] + " is better"}.get(report["decision"], "undecided")
+            low, high = report["interval"]
+            buf.write(f"Sequential test: {verdict} after {report['rounds']} rounds "
+                      f"({report['rounds_saved']} saved), P1 share {low:.3f}-{high:.3f} "
+                      f"at {1 - report['alpha']:.0%}\n")
+        if probe is not None:
+            buf.write("\n" + probe.report() + "\n")
+
+    sys.stdout.write(buf.getvalue())
+    return 0
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(headless())
     main()
@@ -0,0 +1,167 @@
+import json
+import mmap
+import struct
+import time
+
+import numpy as np
+
+from rules import MOVE_CODE
+from vector_engine import score
+
+# ---------- File format ----------
+# magic (8 bytes) | rounds (u64) | meta length (u32) | meta JSON | moves
+#
+# Moves are packed two rounds per byte, 2 bits per player:
+#   bits 0-1 p1 / bits 2-3 p2 of round 2k, bits 4-5 p1 / bits 6-7 p2 of round 2k+1
+# so a billion-round match takes 500 MB. The rounds field is rewritten
+# after every chunk the writer flushes and again when it closes, and a
+# reader that finds it behind the moves on disk (a writer that died
+# mid-chunk) counts the whole bytes instead, so an unfinished log still
+# reads up to its last flushed chunk.
+MAGIC = b"RPSLOG1\0"
+_FIXED = struct.Struct("<8sQI")
+CHUNK_ROUNDS = 1 << 16  # even, so chunks always end on a byte boundary
+
+
+def pack(p1_codes, p2_codes):
+    nibbles = (np.asarray(p1_codes, dtype=np.uint8) | (np.asarray(p2_codes, dtype=np.uint8) << 2))
+    if len(nibbles) % 2:
+        nibbles = np.append(nibbles, np.uint8(0))
+    return (nibbles[0::2] | (nibbles[1::2] << 4)).astype(np.uint8)
+
+
+def unpack(packed, start, stop):
+    # decode rounds [start, stop) from the packed byte view
+    first, last = start // 2, (stop + 1) // 2
+    chunk = packed[first:last]
+    nibbles = np.empty(len(chunk) * 2, dtype=np.uint8)
+    nibbles[0::2] = chunk & 0x0F
+    nibbles[1::2] = chunk >> 4
+    nibbles = nibbles[start - first * 2:stop - first * 2]
+    return (nibbles & 0x03).astype(np.int8), (nibbles >> 2).astype(np.int8)
+
+
+# ---------- Writer ----------
+class MatchLogWriter:
+    def __init__(self, path, bots, seed=None, chunk_rounds=CHUNK_ROUNDS, **meta):
+        self.path = path
+        self.chunk_rounds = chunk_rounds + (chunk_rounds % 2)
+        self.rounds = 0
+        self._p1 = bytearray()
+        self._p2 = bytearray()
+
+        meta = dict(meta, bots=list(bots), seed=seed, created=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        blob = json.dumps(meta).encode()
+        self._file = open(path, "wb")
+        self._file.write(_FIXED.pack(MAGIC, 0, len(blob)))
+        self._file.write(blob)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, p1_play, p2_play):
+        self._p1.append(MOVE_CODE[p1_play])
+        self._p2.append(MOVE_CODE[p2_play])
+        if len(self._p1) >= self.chunk_rounds:
+            self._flush()
+
+    def extend(self, p1_codes, p2_codes):
+        # bulk path for the vectorized engine: int8 code arrays
+        for start in range(0, len(p1_codes), self.chunk_rounds):
+            stop = start + self.chunk_rounds
+            self._p1 += np.asarray(p1_codes[start:stop], dtype=np.uint8).tobytes()
+            self._p2 += np.asarray(p2_codes[start:stop], dtype=np.uint8).tobytes()
+            if len(self._p1) >= self.chunk_rounds:
+                self._flush()
+
+    def _flush(self, final=False):
+        # only whole bytes are written until the final flush
+        n = len(self._p1)
+        if not final:
+            n -= n % 2
+        if not n:
+            return
+        self._file.write(pack(np.frombuffer(self._p1, dtype=np.uint8, count=n),
+                              np.frombuffer(self._p2, dtype=np.uint8, count=n)).tobytes())
+        self.rounds += n
+        del self._p1[:n]
+        del self._p2[:n]
+        self._write_rounds()
+
+    def _write_rounds(self):
+        # the seeks also push the buffered moves out to the file
+        end = self._file.tell()
+        self._file.seek(8)
+        self._file.write(struct.pack("<Q", self.rounds))
+        self._file.seek(end)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._flush(final=True)
+        self._write_rounds()
+        self._file.close()
+
+
+# ---------- Reader ----------
+class MatchLog:
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.rounds, meta_len = _FIXED.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a match log")
+        self.meta = json.loads(self._mm[_FIXED.size:_FIXED.size + meta_len])
+        # a closed log holds rounds or rounds + 1 (padding) moves; fewer means
+        # the writer never finished, and everything on disk is whole bytes
+        on_disk = 2 * (len(self._mm) - _FIXED.size - meta_len)
+        if self.rounds < on_disk - 1:
+            self.rounds = on_disk
+        # zero-copy view of the packed moves, paged in on demand
+        self.packed = np.frombuffer(self._mm, dtype=np.uint8, count=(self.rounds + 1) // 2,
+                                    offset=_FIXED.size + meta_len)
+
+    def __len__(self):
+        return self.rounds
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def bots(self):
+        return self.meta["bots"]
+
+    @property
+    def seed(self):
+        return self.meta.get("seed")
+
+    def moves(self, start=0, stop=None):
+        stop = self.rounds if stop is None else min(stop, self.rounds)
+        return unpack(self.packed, start, stop)
+
+    def iter_chunks(self, chunk_rounds=CHUNK_ROUNDS):
+        for start in range(0, self.rounds, chunk_rounds):
+            stop = min(start + chunk_rounds, self.rounds)
+            p1, p2 = self.moves(start, stop)
+            yield start, p1, p2
+
+    def results(self, chunk_rounds=CHUNK_ROUNDS):
+        totals = {"p1": 0, "p2": 0, "tie": 0}
+        for _, p1, p2 in self.iter_chunks(chunk_rounds):
+            chunk, _ = score(p1, p2)
+            for key, value in chunk.items():
+                totals[key] += value
+        return totals
+
+    def close(self):
+        if self._mm.closed:
+            return
+        del self.packed
+        self._mm.close()
+        self._file.close()
@@ -0,0 +1,56 @@
+import importlib
+from collections import namedtuple
+
+# One table for every frontend. Bots are referenced as "module:attribute"
+# and only imported the first time they are asked for.
+BotSpec = namedtuple("BotSpec", "key label short_label function cls")
+
+BOTS = (
+    BotSpec("easy1", "Easy 1", "Easy 1", "RPS_game:easy1", "RPS_game:Easy1Bot"),
+    BotSpec("easy2", "Easy 2", "Easy 2", "RPS_game:easy2", "RPS_game:Easy2Bot"),
+    BotSpec("medium", "Medium 1", "Medium 1", "RPS_game:medium", "RPS_game:MediumBot"),
+    BotSpec("medium2", "Medium 2", "Medium 2", "RPS_game:medium2", "RPS_game:Medium2Bot"),
+    BotSpec("markov_chain", "Hard (Markov Chain)", "Hard", "RPS_game:markov_chain", "RPS_game:MarkovChainBot"),
+    BotSpec("random_bot", "Random Bot", "Random Bot", "RPS_game:random_bot", "RPS_game:RandomBot"),
+    BotSpec("ensemble", "Ensemble (Meta)", "Ensemble", "ensemble:ensemble", "ensemble:EnsembleBot"),
+)
+
+_SPECS = {spec.key: spec for spec in BOTS}
+_loaded = {}
+
+
+def _load(path):
+    obj = _loaded.get(path)
+    if obj is None:
+        module, attr = path.split(":")
+        obj = _loaded[path] = getattr(importlib.import_module(module), attr)
+    return obj
+
+
+def keys():
+    return [spec.key for spec in BOTS]
+
+
+def spec(key):
+    return _SPECS[key]
+
+
+def get(key):
+    # the shared, function-style bot
+    return _load(_SPECS[key].function)
+
+
+def bot_class(key):
+    return _load(_SPECS[key].cls)
+
+
+def make(key, *args, **kwargs):
+    # a fresh bot with its own state
+    return bot_class(key)(*args, **kwargs)
+
+
+def by_label(label):
+    for spec in BOTS:
+        if label in (spec.label, spec.short_label):
+            return spec
+    raise KeyError(label)
@@ -0,0 +1,102 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+import registry
+from RPS_game import seed_players
+from matchlog import MatchLog
+from rules import MOVE_CODE, MOVES
+from vector_engine import score
+
+# Rebuilds the bots of a logged match at any round without replaying it
+# through a frontend. Bots with a fast_forward method load the recorded
+# moves in one batch; anything else is fed the moves one call at a time.
+#
+# Replays are exact for logs written by any engine: vector_engine draws
+# random_bot's bulk moves from the same stream the per-round engines use.
+
+
+def fast_forward(bot, my_moves, opp_moves):
+    forward = getattr(bot, "fast_forward", None)
+    if forward is not None:
+        forward(my_moves, opp_moves)
+        return
+    prev = ""
+    for opp in opp_moves.tolist():
+        bot(prev)
+        prev = MOVES[opp]
+
+
+def restore(log, rounds):
+    # fresh bots, seeded as in the original match, in their state after `rounds` rounds
+    bot1, bot2 = (registry.make(key) for key in log.bots)
+    if log.seed is not None:
+        seed_players(log.seed, bot1, bot2)
+    p1, p2 = log.moves(0, rounds)
+    fast_forward(bot1, p1, p2)
+    fast_forward(bot2, p2, p1)
+    return bot1, bot2
+
+
+def resume(log, at, rounds):
+    # play `rounds` more rounds from round `at`; returns both move code arrays
+    bot1, bot2 = restore(log, at)
+    p1_prev = p2_prev = ""
+    if at:
+        p1, p2 = log.moves(at - 1, at)
+        p1_prev, p2_prev = MOVES[p2[0]], MOVES[p1[0]]
+
+    p1_moves = np.empty(rounds, dtype=np.int8)
+    p2_moves = np.empty(rounds, dtype=np.int8)
+    for i in range(rounds):
+        p1_play = bot1(p1_prev)
+        p2_play = bot2(p2_prev)
+        p1_moves[i] = MOVE_CODE[p1_play]
+        p2_moves[i] = MOVE_CODE[p2_play]
+        p1_prev, p2_prev = p2_play, p1_play
+    return p1_moves, p2_moves
+
+
+def first_divergence(log, at, p1_moves, p2_moves):
+    # index of the first replayed round that differs from the log, or None
+    logged1, logged2 = log.moves(at, at + len(p1_moves))
+    n = len(logged1)
+    differs = np.flatnonzero((logged1 != p1_moves[:n]) | (logged2 != p2_moves[:n]))
+    return at + int(differs[0]) if len(differs) else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fast-forward a logged match to a round and replay from there.")
+    parser.add_argument("log", help="match log written with --log")
+    parser.add_argument("--at", type=int, default=0, help="round to fast-forward to")
+    parser.add_argument("--rounds", type=int, default=10, help="rounds to replay from there")
+    parser.add_argument("--verify", action="store_true", help="check the replayed moves against the log")
+    args = parser.parse_args(argv)
+
+    with MatchLog(args.log) as log:
+        at = min(args.at, len(log))
+        start = time.perf_counter()
+        p1_moves, p2_moves = resume(log, at, args.rounds)
+        elapsed = time.perf_counter() - start
+
+        print(f"{log.bots[0]} vs {log.bots[1]}, seed {log.seed}: "
+              f"rounds {at}-{at + args.rounds} replayed in {elapsed:.2f}s")
+        if args.rounds <= 20:
+            for i, (a, b) in enumerate(zip(p1_moves.tolist(), p2_moves.tolist()), start=at):
+                print(f"Round {i + 1}: {MOVES[a]} vs {MOVES[b]}")
+        results, _ = score(p1_moves, p2_moves)
+        print(f"P1 Wins: {results['p1']}  P2 Wins: {results['p2']}  Ties: {results['tie']}")
+
+        if args.verify:
+            diverged = first_divergence(log, at, p1_moves, p2_moves)
+            if diverged is not None:
+                print(f"replay diverges from the log at round {diverged + 1}")
+                return 1
+            print("replay matches the log")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+import argparse
+import ast
+import hashlib
+import json
+import os
+import pickle
+import sys
+import zlib
+
+from RPS_game import bot_for
+from rules import RESULT_KEYS
+
+# ---------- On-disk match result cache ----------
+# Pass cache=ResultCache() together with a seed to RPS_game.play, main.play
+# or graph.play_games. An entry is keyed by a hash of
+#   - the source of the engine's module and of each player's module, and
+#     of every local module they import, directly or not (read from the
+#     import statements),
+#   - each player's freshly seeded state (its class and parameters, pickled),
+#   - the seed and the round count,
+# so editing a bot, an engine, or anything they import from this repo,
+# misses on its own. Each engine keeps its own entries.
+# Matches without a seed, with interactive players (humans) or with
+# players that can't be pickled or have no source file are never cached.
+CACHE_VERSION = 1
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".rps_cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+LOW_WATER = 0.9  # eviction frees down to this share of max_bytes
+_SUFFIX = ".rpsc"
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+_digests = {}
+
+
+def _local_imports(path):
+    # the modules of this repo that a source file imports, anywhere in it
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.partition(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.partition(".")[0])
+    return {name: os.path.join(_ROOT, name + ".py") for name in names
+            if os.path.exists(os.path.join(_ROOT, name + ".py"))}
+
+
+def source_digest(module_name):
+    # hash of a module's source plus every local module it imports; None
+    # for modules without a source file (builtins, an interactive session)
+    if module_name in _digests:
+        return _digests[module_name]
+    path = getattr(sys.modules.get(module_name), "__file__", None)
+    digest = None
+    if path and path.endswith(".py"):
+        # named after the file, so a script run as __main__ hashes the same
+        files, todo = {os.path.basename(path)[:-3]: path}, [path]
+        while todo:
+            for name, dep in _local_imports(todo.pop()).items():
+                if name not in files:
+                    files[name] = dep
+                    todo.append(dep)
+
+        h = hashlib.sha256()
+        for name in sorted(files):
+            with open(files[name], "rb") as f:
+                h.update(name.encode() + b"\0" + f.read())
+        digest = h.hexdigest()
+    _digests[module_name] = digest
+    return digest
+
+
+class ResultCache:
+    def __init__(self, path=DEFAULT_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.stores = self.evictions = 0
+        os.makedirs(path, exist_ok=True)
+        # running size of the directory, so a put only lists it when it is
+        # over budget; other processes' writes are picked up at that scan
+        self._bytes = sum(size for _, size, _ in self.entries())
+
+    def key(self, engine, player1, player2, num_games, seed):
+        # call after the engine has seeded the players, with the engine's
+        # module name (__name__); None if not cacheable
+        engine_digest = source_digest(engine)
+        if seed is None or engine_digest is None:
+            return None
+        h = hashlib.sha256(f"v{CACHE_VERSION}:{num_games}:{seed}:{engine_digest}".encode())
+        for player in (player1, player2):
+            bot = bot_for(player)
+            if getattr(bot, "interactive", False):
+                return None
+            # a function's own module, or the module of an object's class
+            digest = source_digest(getattr(bot, "__module__", None))
+            if digest is None:
+                return None
+            try:
+                state = pickle.dumps(bot, protocol=4)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                return None
+            h.update(digest.encode())
+            h.update(state)
+        return h.hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.path, key + _SUFFIX)
+
+    def get(self, key, history=True):
+        # (results, history or None), or None on a miss
+        path = self._file(key)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                packed = f.read()
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if history and not meta["history"]:
+            self.misses += 1
+            return None
+        self.hits += 1
+        os.utime(path)  # mark as recently used
+        past = None
+        if history:
+            past = [RESULT_KEYS[code] for code in zlib.decompress(packed)]
+        return meta["results"], past
+
+    def put(self, key, results, history=None):
+        codes = b""
+        if history is not None:
+            code_of = {k: i for i, k in enumerate(RESULT_KEYS)}
+            codes = zlib.compress(bytes(code_of[h] for h in history), 6)
+        meta = {"results": results, "history": history is not None}
+
+        path = self._file(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(json.dumps(meta).encode() + b"\n")
+            f.write(codes)
+            size = f.tell()
+        try:
+            self._bytes -= os.stat(path).st_size  # an entry being replaced
+        except OSError:
+            pass
+        os.replace(tmp, path)
+        self._bytes += size
+        self.stores += 1
+        if self._bytes > self.max_bytes:
+            self._evict()
+
+    def entries(self):
+        out = []
+        for name in os.listdir(self.path):
+            if name.endswith(_SUFFIX):
+                st = os.stat(os.path.join(self.path, name))
+                out.append((st.st_mtime, st.st_size, name))
+        return out
+
+    def _evict(self):
+        # least recently used first, down to LOW_WATER of max_bytes so the
+        # next scan is many puts away
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            for _, size, name in sorted(entries):
+                if total <= self.max_bytes * LOW_WATER:
+                    break
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+        self._bytes = total
+
+    def clear(self):
+        for _, _, name in self.entries():
+            os.remove(os.path.join(self.path, name))
+        self._bytes = 0
+
+    def stats(self):
+        entries = self.entries()
+        return {"hits": self.hits, "misses": self.misses, "stores": self.stores,
+                "evictions": self.evictions, "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or clear the match result cache.")
+    parser.add_argument("command", choices=("stats", "clear"))
+    parser.add_argument("--dir", default=DEFAULT_DIR)
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(args.dir)
+    if args.command == "clear":
+        cache.clear()
+    print(json.dumps(cache.stats()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,21 @@
 # rps_pygame_frontend_assets.py
+import argparse
+import functools
+import heapq
+import itertools
+import numpy as np
 import pygame
+import queue
 import time
 import threading
 import os
 import math
 import random
+from collections import namedtuple
 
-from RPS_game import (
-    easy1, easy2, medium, medium2, markov_chain, random_bot
-)
-from graph import plot_graph
+import registry
+from RPS_game import seed_players
+from rules import MOVE_CODE, MOVE_NAMES, OUTCOME, RESULT_KEYS
 
 # ---------- Config ----------
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
@@ -33,12 +39,26 @@ FPS = 60
 ICON_SIZE = (140, 140)
 BUTTON_SIZE = (160, 60)
 
-# ---------- Init ----------
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Rock Paper Scissors — Polished Frontend")
+# audio: a small mixer buffer keeps click/win/lose sounds from lagging the
+# click (pre_init only counts if it runs before pygame.init)
+MIXER_FREQ = 44100
+MIXER_BUFFER = 512
 
-clock = pygame.time.Clock()
+# ---------- Bot list ----------
+BOT_LIST = [(spec.short_label, spec.key) for spec in registry.BOTS]
+
+CHOICE_NAMES = dict(zip("RPS", MOVE_NAMES))
+CHOICE_ASSETS = {"R": ASSET_ROCK, "P": ASSET_PAPER, "S": ASSET_SCISSORS}
+
+# ---------- Assets ----------
+# Importing this module doesn't touch pygame; App.start() opens the window
+# and loads only the fonts before drawing the first frame. Images and sounds
+# are then decoded on a worker thread, and the main loop swaps each one in
+# as it arrives (poll). Until then icons draw as a grey placeholder, the
+# background is a flat colour and sounds are silent.
+IMAGE_ASSETS = (ASSET_BG, ASSET_ROCK, ASSET_PAPER, ASSET_SCISSORS)
+SOUND_ASSETS = (ASSET_CLICK, ASSET_WIN, ASSET_LOSE)
+OPAQUE_ASSETS = {ASSET_BG}  # convert() rather than convert_alpha(): no per-pixel alpha to blend
 
 # fonts (try custom font)
 def load_font(size):
@@ -47,81 +67,104 @@ def load_font(size):
     except Exception:
         return pygame.font.SysFont(None, size)
 
-FONT = load_font(22)
-BIG = load_font(42)
-SM = load_font(18)
+def make_placeholder(size=(100, 100)):
+    placeholder = pygame.Surface(size, pygame.SRCALPHA)
+    placeholder.fill((160,160,160,220))
+    pygame.draw.rect(placeholder, (80,80,80), placeholder.get_rect(), 4)
+    return placeholder
 
-# ---------- Asset loaders with fallbacks ----------
-def load_image(name, fallback_surface=None):
-    path = os.path.join(ASSETS_DIR, name)
-    try:
-        img = pygame.image.load(path).convert_alpha()
-        return img
-    except Exception as e:
-        # fallback to provided surface or a placeholder rect
-        if fallback_surface:
-            return fallback_surface
-        placeholder = pygame.Surface((100,100), pygame.SRCALPHA)
-        placeholder.fill((160,160,160,220))
-        pygame.draw.rect(placeholder, (80,80,80), placeholder.get_rect(), 4)
-        return placeholder
-
-def load_sound(name):
-    path = os.path.join(ASSETS_DIR, name)
-    try:
-        snd = pygame.mixer.Sound(path)
-        return snd
-    except Exception:
-        return None
-
-def play_sound_if_loaded(snd):
-    if snd:
-        try:
-            snd.play()
-        except Exception:
-            pass
-
-# images
-bg_img = load_image(ASSET_BG, fallback_surface=None)  # may be None/placeholder
-rock_img = load_image(ASSET_ROCK)
-paper_img = load_image(ASSET_PAPER)
-scissors_img = load_image(ASSET_SCISSORS)
-
-# sounds
-click_snd = load_sound(ASSET_CLICK)
-win_snd = load_sound(ASSET_WIN)
-lose_snd = load_sound(ASSET_LOSE)
-
-# background music (looped)
-bgm_path = os.path.join(ASSETS_DIR, ASSET_BGM)
-if os.path.exists(bgm_path):
-    try:
-        pygame.mixer.music.load(bgm_path)
-        pygame.mixer.music.set_volume(0.45)
-        pygame.mixer.music.play(-1)  # loop forever
-    except Exception:
-        pass
-
-# ---------- Bot list ----------
-BOT_LIST = [
-    ("Easy 1", easy1),
-    ("Easy 2", easy2),
-    ("Medium 1", medium),
-    ("Medium 2", medium2),
-    ("Hard ", markov_chain),
-    ("Random Bot", random_bot),
-]
-
-CHOICE_NAMES = {"R": "Rock", "P": "Paper", "S": "Scissors"}
-CHOICE_TO_IMG = {"R": rock_img, "P": paper_img, "S": scissors_img}
+class Assets:
+    def __init__(self):
+        self.font = self.big = self.small = None
+        self.placeholder = None
+        self.images = {}
+        self.sounds = {}
+        self.ready = False
+        self._decoded = queue.SimpleQueue()
+
+    def load_fonts(self):
+        self.font = load_font(22)
+        self.big = load_font(42)
+        self.small = load_font(18)
+        self.placeholder = make_placeholder()
+
+    def start_loading(self):
+        threading.Thread(target=self._decode_all, name="asset-loader", daemon=True).start()
+
+    def _decode_all(self):
+        # worker thread: file reads and decoding only, never the display
+        for name in IMAGE_ASSETS:
+            try:
+                self._decoded.put(("image", name, pygame.image.load(os.path.join(ASSETS_DIR, name))))
+            except Exception:
+                pass  # missing or broken: keeps its placeholder
+        for name in SOUND_ASSETS:
+            try:
+                self._decoded.put(("sound", name, pygame.mixer.Sound(os.path.join(ASSETS_DIR, name))))
+            except Exception:
+                pass
+        self._decoded.put(("done", None, None))
+
+    def poll(self):
+        # main thread, once per frame; True if an image arrived (redraw needed)
+        changed = False
+        while True:
+            try:
+                kind, name, item = self._decoded.get_nowait()
+            except queue.Empty:
+                return changed
+            if kind == "image":
+                self.images[name] = item.convert() if name in OPAQUE_ASSETS else item.convert_alpha()
+                changed = True
+            elif kind == "sound":
+                self.sounds[name] = item
+            else:
+                self.ready = True
+                self.start_music()
+
+    def image(self, name):
+        return self.images.get(name, self.placeholder)
+
+    def play(self, name):
+        snd = self.sounds.get(name)
+        if snd:
+            try:
+                snd.play()
+            except Exception:
+                pass
+
+    def start_music(self):
+        # background music (looped); streamed by the mixer, so cheap to start
+        bgm_path = os.path.join(ASSETS_DIR, ASSET_BGM)
+        if os.path.exists(bgm_path):
+            try:
+                pygame.mixer.music.load(bgm_path)
+                pygame.mixer.music.set_volume(0.45)
+                pygame.mixer.music.play(-1)  # loop forever
+            except Exception:
+                pass
 
 # ---------- Helpers ----------
+# Scaled images and rendered text are the same frame after frame, so both
+# are memoised in bounded LRU caches and only rebuilt after a resize.
+SCALE_CACHE_SIZE = 64
+TEXT_CACHE_SIZE = 256
+
+@functools.lru_cache(maxsize=SCALE_CACHE_SIZE)
 def scaled(img, w, h):
     try:
         return pygame.transform.smoothscale(img, (w, h))
     except Exception:
         return pygame.transform.scale(img, (w, h))
 
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(font, text, color):
+    return font.render(text, True, color)
+
+def clear_render_caches():
+    scaled.cache_clear()
+    render_text.cache_clear()
+
 def center_rect_for(img, center):
     rect = img.get_rect()
     rect.center = center
@@ -137,7 +180,7 @@ class UIButton:
         self.base_color = base_color
         self.hover_color = hover_color
 
-    def draw(self, surf, mouse_pos):
+    def draw(self, surf, mouse_pos, font):
         is_hover = self.rect.collidepoint(mouse_pos)
         color = self.hover_color if is_hover else self.base_color
         pygame.draw.rect(surf, color, self.rect, border_radius=self.rounded)
@@ -145,45 +188,150 @@ class UIButton:
             img = scaled(self.image, self.rect.width - 12, self.rect.height - 12)
             surf.blit(img, (self.rect.x + 6, self.rect.y + 6))
         if self.text:
-            txt = FONT.render(self.text, True, (240,240,240))
+            txt = render_text(font, self.text, (240,240,240))
             surf.blit(txt, (self.rect.x + (self.rect.width - txt.get_width())//2,
                             self.rect.y + (self.rect.height - txt.get_height())//2))
 
     def clicked(self, pos):
         return self.rect.collidepoint(pos)
 
-# ---------- Simple confetti particle for win effect ----------
-particles = []
-def spawn_confetti(x, y, amount=40):
-    for _ in range(amount):
-        particles.append({
-            "x": x,
-            "y": y,
-            "vx": random.uniform(-3,3),
-            "vy": random.uniform(-6,-1),
-            "life": random.uniform(0.6,1.6),
-            "color": (random.randint(50,255), random.randint(50,255), random.randint(50,255))
-        })
-
-def update_particles(dt):
-    alive = []
-    for p in particles:
-        p["vy"] += 9.8 * dt  # gravity
-        p["x"] += p["vx"]
-        p["y"] += p["vy"]
-        p["life"] -= dt
-        if p["life"] > 0:
-            alive.append(p)
-    particles[:] = alive
-
-def draw_particles(surf):
-    for p in particles:
-        r = max(1, int(4 * p["life"]))
-        pygame.draw.circle(surf, p["color"], (int(p["x"]), int(p["y"])), r)
+# ---------- Confetti particle system for win effect ----------
+# Struct-of-arrays: every particle attribute lives in a preallocated NumPy
+# array of fixed capacity, physics runs on all of them at once and dead
+# slots are reused by the next spawn.
+PARTICLE_CAPACITY = 8192
+CONFETTI_AMOUNT = 40
+GRAVITY = 588.0          # px/s^2 (the old 9.8 px/frame^2 at 60 FPS)
+MAX_PARTICLE_RADIUS = 7
+
+class ParticleSystem:
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.rng = np.random.default_rng()
+        self._offsets = {}
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def spawn(self, x, y, amount):
+        slots = np.flatnonzero(~self.alive)[:amount]
+        n = len(slots)
+        if not n:
+            return
+        rng = self.rng
+        self.x[slots] = x
+        self.y[slots] = y
+        # px/s, same spread as the old per-frame velocities at 60 FPS
+        self.vx[slots] = rng.uniform(-180, 180, n)
+        self.vy[slots] = rng.uniform(-360, -60, n)
+        self.life[slots] = rng.uniform(0.6, 1.6, n)
+        self.color[slots] = rng.integers(50, 256, (n, 3))
+        self.alive[slots] = True
+
+    def update(self, dt):
+        live = self.alive
+        if not live.any():
+            return
+        self.vy[live] += GRAVITY * dt
+        self.x[live] += self.vx[live] * dt
+        self.y[live] += self.vy[live] * dt
+        self.life[live] -= dt
+        live &= self.life > 0
+
+    def bounds(self):
+        idx = np.flatnonzero(self.alive)
+        if not len(idx):
+            return None
+        r = MAX_PARTICLE_RADIUS
+        left, top = int(self.x[idx].min()) - r, int(self.y[idx].min()) - r
+        right, bottom = int(self.x[idx].max()) + r, int(self.y[idx].max()) + r
+        return pygame.Rect(left, top, right - left + 1, bottom - top + 1)
+
+    def _disc(self, r):
+        offsets = self._offsets.get(r)
+        if offsets is None:
+            d = np.arange(-r, r + 1)
+            dx, dy = np.meshgrid(d, d)
+            inside = dx * dx + dy * dy <= r * r
+            offsets = self._offsets[r] = (dx[inside], dy[inside])
+        return offsets
+
+    def draw(self, surf):
+        idx = np.flatnonzero(self.alive)
+        if not len(idx):
+            return
+        xs = self.x[idx].astype(np.int32)
+        ys = self.y[idx].astype(np.int32)
+        radius = np.maximum(1, (4 * self.life[idx]).astype(np.int32))
+        colors = self.color[idx]
+
+        try:
+            pixels = pygame.surfarray.pixels3d(surf)
+        except Exception:
+            for x, y, r, c in zip(xs.tolist(), ys.tolist(), radius.tolist(), colors.tolist()):
+                pygame.draw.circle(surf, c, (x, y), r)
+            return
+
+        # one scatter per radius: every particle's disc pixels at once
+        w, h = surf.get_size()
+        for r in np.unique(radius).tolist():
+            sel = radius == r
+            dx, dy = self._disc(r)
+            px = (xs[sel, None] + dx).ravel()
+            py = (ys[sel, None] + dy).ravel()
+            col = np.repeat(colors[sel], len(dx), axis=0)
+            ok = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+            pixels[px[ok], py[ok]] = col[ok]
+        del pixels
+
+# ---------- Timed events ----------
+# Reveal delays and bot-round pacing are timed callbacks run from the main
+# loop, so nothing ever sleeps on the event thread and all match state is
+# only touched by that one thread.
+HUMAN_REVEAL_SEC = 0.25
+BOT_SHAKE_SEC = 0.6
+BOT_REVEAL_SEC = 0.4
+
+class Scheduler:
+    def __init__(self):
+        self._queue = []
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def after(self, delay, callback, *args):
+        heapq.heappush(self._queue, (time.perf_counter() + delay, next(self._seq), callback, args))
+
+    def clear(self):
+        self._queue.clear()
+
+    def run_due(self):
+        now = time.perf_counter()
+        while self._queue and self._queue[0][0] <= now:
+            _, _, callback, args = heapq.heappop(self._queue)
+            callback(*args)
+
+    def seconds_until_next(self):
+        if not self._queue:
+            return None
+        return max(0.0, self._queue[0][0] - time.perf_counter())
+
+# What the renderer sees: one immutable copy, replaced once per round
+RoundSnapshot = namedtuple("RoundSnapshot", "round_index results last_round playing")
 
 # ---------- Match runner (similar to previous) ----------
 class MatchRunner:
-    def __init__(self):
+    def __init__(self, scheduler, on_round=None):
+        self.scheduler = scheduler
+        self.on_round = on_round  # called with the snapshot after each human round
         self.reset_match()
 
     def reset_match(self):
@@ -194,321 +342,464 @@ class MatchRunner:
         self.rounds_total = 5
         self.round_index = 0
         self.playing = False
+        self.revealing = False
         self.last_round = None  # (p1,p2,result)
         self.mode = "Human vs Bot"
         self.bot1_idx = 0
         self.bot2_idx = 1
+        self.seed = None
+        self.bot1 = self.bot2 = None
         self.cpu_reveal_progress = 0.0  # for shake animation
         self.revealed_choice = None
-
-    def reset_bot_states_if_needed(self):
-        # reset markov_chain and other stateful bots by calling with empty prev
-        for name, func in (BOT_LIST[self.bot1_idx], BOT_LIST[self.bot2_idx]):
-            if func is markov_chain:
-                try:
-                    func('')
-                except Exception:
-                    pass
+        self.publish()
+
+    def publish(self):
+        self.snapshot = RoundSnapshot(self.round_index, dict(self.results), self.last_round, self.playing)
+
+    def new_match(self, seed=None):
+        # every match gets fresh bots on their own seeded RNG streams, so any
+        # match can be replayed from its seed
+        self.seed = random.SystemRandom().getrandbits(32) if seed is None else seed
+        self.bot1 = registry.make(BOT_LIST[self.bot1_idx][1])
+        self.bot2 = registry.make(BOT_LIST[self.bot2_idx][1])
+        seed_players(self.seed, self.bot1, self.bot2)
+        self.scheduler.clear()
+        self.history = []
+        self.results = {"p1":0, "p2":0, "tie":0}
+        self.p1_prev = ""
+        self.p2_prev = ""
+        self.round_index = 0
+        self.revealing = False
 
     def play_one_round(self, p1_func, p2_func, human_choice=None):
         # p1 is function that expects opponent previous; human_choice if present used as p1 play
         if human_choice is not None:
             p1_play = human_choice
         else:
-            p1_play = p1_func(self.p2_prev)
-        p2_play = p2_func(self.p1_prev)
+            p1_play = p1_func(self.p1_prev)
+        p2_play = p2_func(self.p2_prev)
 
         # decide winner
-        if p1_play == p2_play:
-            result = "tie"
-            self.results["tie"] += 1
-        else:
-            wins = {("P","R"), ("R","S"), ("S","P")}
-            if (p1_play, p2_play) in wins:
-                result = "p1"
-                self.results["p1"] += 1
-            else:
-                result = "p2"
-                self.results["p2"] += 1
+        result = RESULT_KEYS[OUTCOME[MOVE_CODE[p1_play]][MOVE_CODE[p2_play]]]
+        self.results[result] += 1
 
         self.history.append(result)
         self.last_round = (p1_play, p2_play, result)
         self.p1_prev, self.p2_prev = p2_play, p1_play
         self.round_index += 1
 
-    def run_bot_vs_bot(self):
+    # -- bot vs bot: shake for BOT_SHAKE_SEC, reveal, hold for BOT_REVEAL_SEC
+    def start_bot_vs_bot(self, seed=None):
+        if self.playing:
+            return
+        self.new_match(seed)
+        self.last_round = None
         self.playing = True
-        self.reset_bot_states_if_needed()
-        bot1_func = BOT_LIST[self.bot1_idx][1]
-        bot2_func = BOT_LIST[self.bot2_idx][1]
-        self.p1_prev = ""
-        self.p2_prev = ""
-        self.round_index = 0
         self.revealed_choice = None
-        while self.playing and self.round_index < self.rounds_total:
-            # "shake" for 0.6s visually, then reveal
-            self.cpu_reveal_progress = 0.0
-            # to visually show shaking we update progress in main thread; here we just sleep
-            time.sleep(0.6)
-            self.play_one_round(bot1_func, bot2_func)
-            self.revealed_choice = self.last_round[1]
-            time.sleep(0.4)
-        self.playing = False
+        self.publish()
+        self.scheduler.after(BOT_SHAKE_SEC, self._bot_round)
 
-    def run_human_vs_bot_single(self, choice):
-        # plays one human round instantly (called from UI)
+    def _bot_round(self):
         if not self.playing:
             return
-        bot_func = BOT_LIST[self.bot2_idx][1]
-        # simulate small delay for CPU reveal
         self.cpu_reveal_progress = 0.0
-        time.sleep(0.25)
-        self.play_one_round(lambda prev: choice, bot_func, human_choice=choice)
+        self.play_one_round(self.bot1, self.bot2)
+        self.revealed_choice = self.last_round[1]
+        self.publish()
+        self.scheduler.after(BOT_REVEAL_SEC, self._bot_next)
+
+    def _bot_next(self):
+        if self.playing and self.round_index < self.rounds_total:
+            self.scheduler.after(BOT_SHAKE_SEC, self._bot_round)
+        else:
+            self.playing = False
+            self.publish()
 
-match = MatchRunner()
+    # -- human vs bot: the CPU's move is revealed HUMAN_REVEAL_SEC after a click
+    def start_human(self, seed=None):
+        self.new_match(seed)
+        self.playing = True
+        self.publish()
 
-# ---------- UI elements creation ----------
-# Positions
+    def run_human_vs_bot_single(self, choice):
+        # queues one human round (called from UI); ignored while a reveal is pending
+        if not self.playing or self.revealing or self.round_index >= self.rounds_total:
+            return False
+        self.revealing = True
+        self.cpu_reveal_progress = 0.0
+        self.scheduler.after(HUMAN_REVEAL_SEC, self._reveal_human, choice)
+        return True
+
+    def _reveal_human(self, choice):
+        self.revealing = False
+        self.play_one_round(None, self.bot2, human_choice=choice)
+        if self.round_index >= self.rounds_total:
+            self.playing = False
+        self.publish()
+        if self.on_round:
+            self.on_round(self.snapshot)
+
+# ---------- Layout ----------
 left_col_x = 40
 right_col_x = 450
-
-btn_play = UIButton((WIDTH - 350, HEIGHT - 120, 180, 56), text="Play Match")
-btn_mode = UIButton((left_col_x, 50, 240, 44), text="Mode: Human vs Bot")
-
-btn_bot1_left = UIButton((left_col_x, 120, 48, 44), text="<")
-btn_bot1_right = UIButton((left_col_x + 160, 120, 48, 44), text=">")
-btn_bot2_left = UIButton((left_col_x, 190, 48, 44), text="<")
-btn_bot2_right = UIButton((left_col_x + 160, 190, 48, 44), text=">")
-
-btn_rounds_minus = UIButton((left_col_x, 260, 48, 44), text="-")
-btn_rounds_plus = UIButton((left_col_x + 160, 260, 48, 44), text="+")
-
-btn_rock = UIButton((right_col_x + 20, 430, 150, 90), text="ROCK", image=rock_img)
-btn_paper = UIButton((right_col_x + 190, 430, 150, 90), text="PAPER", image=paper_img)
-btn_scissors = UIButton((right_col_x + 360, 430, 150, 90), text="SCISSORS", image=scissors_img)
-
-# ---------- Utilities ----------
-def start_bot_vs_bot_thread():
-    if match.playing:
-        return
-    match.history = []
-    match.results = {"p1":0, "p2":0, "tie":0}
-    match.last_round = None
-    match.p1_prev = ""
-    match.p2_prev = ""
-    match.round_index = 0
-    t = threading.Thread(target=match.run_bot_vs_bot, daemon=True)
-    t.start()
-
-def end_match_and_plot_once():
-    name1 = BOT_LIST[match.bot1_idx][0] if match.mode == "Bot vs Bot" else "You"
-    name2 = BOT_LIST[match.bot2_idx][0]
-    threading.Thread(target=plot_graph, args=(match.history, name1, name2), daemon=True).start()
-
-# ---------- Main loop ----------
-running = True
-plot_triggered = False
-
-while running:
-    dt = clock.tick(FPS) / 1000.0
-    mouse_pos = pygame.mouse.get_pos()
-
-    # event handling
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            if btn_play.clicked(event.pos):
-                play_sound_if_loaded(click_snd)
-                if match.mode == "Bot vs Bot":
-                    start_bot_vs_bot_thread()
-                else:
-                    # start human match mode (just set playing True)
-                    match.playing = True
-                    match.history = []
-                    match.results = {"p1":0, "p2":0, "tie":0}
-                    match.p1_prev = ""
-                    match.p2_prev = ""
-                    match.round_index = 0
-            elif btn_mode.clicked(event.pos):
-                play_sound_if_loaded(click_snd)
-                match.mode = "Bot vs Bot" if match.mode == "Human vs Bot" else "Human vs Bot"
-                btn_mode.text = f"Mode: {match.mode}"
-            elif btn_bot1_left.clicked(event.pos):
-                play_sound_if_loaded(click_snd)
-                match.bot1_idx = (match.bot1_idx - 1) % len(BOT_LIST)
-            elif btn_bot1_right.clicked(event.pos):
-                play_sound_if_loaded(click_snd)
-                match.bot1_idx = (match.bot1_idx + 1) % len(BOT_LIST)
-            elif btn_bot2_left.clicked(event.pos):
-                play_sound_if_loaded(click_snd)
-                match.bot2_idx = (match.bot2_idx - 1) % len(BOT_LIST)
-            elif btn_bot2_right.clicked(event.pos):
-                play_sound_if_loaded(click_snd)
-                match.bot2_idx = (match.bot2_idx + 1) % len(BOT_LIST)
-            elif btn_rounds_minus.clicked(event.pos):
-                play_sound_if_loaded(click_snd)
-                match.rounds_total = max(1, match.rounds_total - 1)
-            elif btn_rounds_plus.clicked(event.pos):
-                play_sound_if_loaded(click_snd)
-                match.rounds_total = match.rounds_total + 1
-            elif btn_rock.clicked(event.pos) and match.mode == "Human vs Bot":
-                if match.playing and match.round_index < match.rounds_total:
-                    play_sound_if_loaded(click_snd)
-                    match.run_human_vs_bot_single("R")
-                    # play reveal sound & confetti if win
-                    if match.last_round:
-                        if match.last_round[2] == "p1":
-                            play_sound_if_loaded(win_snd)
-                            spawn_confetti(WIDTH//2, HEIGHT//2)
-                        elif match.last_round[2] == "p2":
-                            play_sound_if_loaded(lose_snd)
-                    if match.round_index >= match.rounds_total:
-                        match.playing = False
-                        plot_triggered = True
-            elif btn_paper.clicked(event.pos) and match.mode == "Human vs Bot":
-                if match.playing and match.round_index < match.rounds_total:
-                    play_sound_if_loaded(click_snd)
-                    match.run_human_vs_bot_single("P")
-                    if match.last_round:
-                        if match.last_round[2] == "p1":
-                            play_sound_if_loaded(win_snd)
-                            spawn_confetti(WIDTH//2, HEIGHT//2)
-                        elif match.last_round[2] == "p2":
-                            play_sound_if_loaded(lose_snd)
-                    if match.round_index >= match.rounds_total:
-                        match.playing = False
-                        plot_triggered = True
-            elif btn_scissors.clicked(event.pos) and match.mode == "Human vs Bot":
-                if match.playing and match.round_index < match.rounds_total:
-                    play_sound_if_loaded(click_snd)
-                    match.run_human_vs_bot_single("S")
-                    if match.last_round:
-                        if match.last_round[2] == "p1":
-                            play_sound_if_loaded(win_snd)
-                            spawn_confetti(WIDTH//2, HEIGHT//2)
-                        elif match.last_round[2] == "p2":
-                            play_sound_if_loaded(lose_snd)
-                    if match.round_index >= match.rounds_total:
-                        match.playing = False
-                        plot_triggered = True
-
-    # Update animation state
-    update_particles(dt)
-
-    # Draw background
-    screen.fill((18,20,28))
-    if bg_img:
-        try:
-            b = scaled(bg_img, WIDTH, HEIGHT)
-            screen.blit(b, (0,0))
-        except Exception:
-            pass
-
-    # Left column (controls)
-    screen_rect = screen.get_rect()
-    draw_x = left_col_x = 40
-    draw_y = 32
-
-    title_surf = BIG.render("Rock • Paper • Scissors", True, (245,245,245))
-    screen.blit(title_surf, (left_col_x, 6))
-
-    btn_mode.draw(screen, mouse_pos)
-
-    # Bot selectors
-    draw_label = lambda txt, x, y: screen.blit(FONT.render(txt, True, (255,235,120)), (x,y))
-    draw_label("Bot 1:", left_col_x, 120 - 24)
-    btn_bot1_left.draw(screen, mouse_pos)
-    btn_bot1_right.draw(screen, mouse_pos)
-    draw_label(BOT_LIST[match.bot1_idx][0], left_col_x + 60, 126)
-
-    draw_label("Bot 2:", left_col_x, 190 - 24)
-    btn_bot2_left.draw(screen, mouse_pos)
-    btn_bot2_right.draw(screen, mouse_pos)
-    draw_label(BOT_LIST[match.bot2_idx][0], left_col_x + 60, 196)
-
-    draw_label("Rounds:", left_col_x, 260 - 24)
-    btn_rounds_minus.draw(screen, mouse_pos)
-    btn_rounds_plus.draw(screen, mouse_pos)
-    draw_label(str(match.rounds_total), left_col_x + 60, 266)
-
-    PLAY_IDLE_COLOR = (40, 180, 40)      # green
-    PLAY_ACTIVE_COLOR = (60, 60, 60) 
-    if match.playing:
-        btn_play.base_color = PLAY_ACTIVE_COLOR
-        btn_play.hover_color = PLAY_ACTIVE_COLOR   # no hover during play
-    else:
-        btn_play.base_color = PLAY_IDLE_COLOR
-        btn_play.hover_color = (70, 220, 70)       # lighter green on hover
-    if match.playing:
-        btn_play.text = "Playing..."
-    else:
-        btn_play.text = "Play Match"
-
-    btn_play.draw(screen, mouse_pos)
-
-    # Right column (game area)
-    right_x = 480
-    draw_label("Scores:", right_x, 80)
-    draw_label(f"P1: {match.results['p1']}", right_x, 120)
-    draw_label(f"P2: {match.results['p2']}", right_x, 150)
-    draw_label(f"Ties: {match.results['tie']}", right_x, 180)
-
-    # Last round display with icons and small shake for CPU reveal
-    if match.last_round:
-        p1_play, p2_play, result = match.last_round
-        # left icon (P1)
-        left_center = (right_x + 120, 270)
-        right_center = (right_x + 340, 270)
-
-        img1 = CHOICE_TO_IMG.get(p1_play)
-        img2 = CHOICE_TO_IMG.get(p2_play)
-
-        if img1:
-            im1 = scaled(img1, 140, 140)
-            screen.blit(im1, center_rect_for(im1, left_center))
+right_x = 480
+
+PLAY_IDLE_COLOR = (40, 180, 40)      # green
+PLAY_ACTIVE_COLOR = (60, 60, 60)
+
+# ---------- Dirty regions ----------
+# Each region is redrawn and pushed to the display only when its state key
+# differs from the previous frame's. A frame with no changes draws nothing.
+REGION_TITLE = pygame.Rect(left_col_x, 0, 420, 50)
+REGION_BOT1 = pygame.Rect(left_col_x, 96, 220, 70)
+REGION_BOT2 = pygame.Rect(left_col_x, 166, 220, 70)
+REGION_ROUNDS = pygame.Rect(left_col_x, 236, 220, 70)
+REGION_SCORES = pygame.Rect(right_x, 80, 300, 130)
+REGION_LAST_ROUND = pygame.Rect(right_x + 40, 195, 390, 215)
+REGION_MOVES = pygame.Rect(right_x - 10, 398, 500, 125)
+IDLE_WAIT_MS = 250
+
+def hovered(btn, mouse_pos):
+    return btn.rect.collidepoint(mouse_pos)
+
+# ---------- App ----------
+# All UI state lives on the App. Creating one doesn't open a window, so the
+# match logic and layout can be used headless; start() brings pygame up and
+# run() starts the main loop. first_frame_ms / assets_ms time the startup
+# from App creation.
+class App:
+    def __init__(self):
+        self.created = time.perf_counter()
+        self.first_frame_ms = None
+        self.assets_ms = None
+        self.screen = None
+        self.clock = None
+        self.assets = Assets()
+        self.particles = ParticleSystem()
+        self.scheduler = Scheduler()
+        self.match = MatchRunner(self.scheduler, on_round=self.human_round_done)
+
+        self.btn_play = UIButton((WIDTH - 350, HEIGHT - 120, 180, 56), text="Play Match")
+        self.btn_mode = UIButton((left_col_x, 50, 240, 44), text="Mode: Human vs Bot")
+
+        self.btn_bot1_left = UIButton((left_col_x, 120, 48, 44), text="<")
+        self.btn_bot1_right = UIButton((left_col_x + 160, 120, 48, 44), text=">")
+        self.btn_bot2_left = UIButton((left_col_x, 190, 48, 44), text="<")
+        self.btn_bot2_right = UIButton((left_col_x + 160, 190, 48, 44), text=">")
+
+        self.btn_rounds_minus = UIButton((left_col_x, 260, 48, 44), text="-")
+        self.btn_rounds_plus = UIButton((left_col_x + 160, 260, 48, 44), text="+")
+
+        self.btn_rock = UIButton((right_col_x + 20, 430, 150, 90), text="ROCK")
+        self.btn_paper = UIButton((right_col_x + 190, 430, 150, 90), text="PAPER")
+        self.btn_scissors = UIButton((right_col_x + 360, 430, 150, 90), text="SCISSORS")
+        self.move_buttons = {"R": self.btn_rock, "P": self.btn_paper, "S": self.btn_scissors}
+
+        self.running = False
+        self.plot_triggered = False
+        self.full_redraw = True
+        self.prev_states = {}
+        self.prev_particle_bounds = None
+        self.idle = False
+
+    def start(self):
+        pygame.mixer.pre_init(MIXER_FREQ, -16, 2, MIXER_BUFFER)
+        pygame.init()
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Rock Paper Scissors — Polished Frontend")
+        self.clock = pygame.time.Clock()
+        self.assets.load_fonts()
+        self.update_images()
+        self.running = True
+
+    def update_images(self):
+        # point the move buttons at whatever the assets hold right now
+        for choice, btn in self.move_buttons.items():
+            btn.image = self.assets.image(CHOICE_ASSETS[choice])
+
+    # ---------- Utilities ----------
+    def human_round_done(self, snapshot):
+        # play reveal sound & confetti if win
+        if snapshot.last_round:
+            if snapshot.last_round[2] == "p1":
+                self.assets.play(ASSET_WIN)
+                self.particles.spawn(WIDTH//2, HEIGHT//2, CONFETTI_AMOUNT)
+            elif snapshot.last_round[2] == "p2":
+                self.assets.play(ASSET_LOSE)
+        if not snapshot.playing:
+            self.plot_triggered = True
+
+    def end_match_and_plot_once(self):
+        from graph import plot_graph
+        match = self.match
+        name1 = BOT_LIST[match.bot1_idx][0] if match.mode == "Bot vs Bot" else "You"
+        name2 = BOT_LIST[match.bot2_idx][0]
+        threading.Thread(target=plot_graph, args=(match.history, name1, name2), daemon=True).start()
+
+    # ---------- Scene drawing ----------
+    def draw_scene(self, mouse_pos):
+        screen, match, assets = self.screen, self.match, self.assets
+        font, big = assets.font, assets.big
+        snap = match.snapshot
+
+        # Draw background (flat colour until the image has loaded)
+        screen.fill((18,20,28))
+        bg_img = assets.images.get(ASSET_BG)
+        if bg_img:
+            try:
+                b = scaled(bg_img, *screen.get_size())
+                screen.blit(b, (0,0))
+            except Exception:
+                pass
+
+        # Left column (controls)
+        title_surf = render_text(big, "Rock • Paper • Scissors", (245,245,245))
+        screen.blit(title_surf, (left_col_x, 6))
+
+        self.btn_mode.draw(screen, mouse_pos, font)
+
+        # Bot selectors
+        draw_label = lambda txt, x, y: screen.blit(render_text(font, txt, (255,235,120)), (x,y))
+        draw_label("Bot 1:", left_col_x, 120 - 24)
+        self.btn_bot1_left.draw(screen, mouse_pos, font)
+        self.btn_bot1_right.draw(screen, mouse_pos, font)
+        draw_label(BOT_LIST[match.bot1_idx][0], left_col_x + 60, 126)
+
+        draw_label("Bot 2:", left_col_x, 190 - 24)
+        self.btn_bot2_left.draw(screen, mouse_pos, font)
+        self.btn_bot2_right.draw(screen, mouse_pos, font)
+        draw_label(BOT_LIST[match.bot2_idx][0], left_col_x + 60, 196)
+
+        draw_label("Rounds:", left_col_x, 260 - 24)
+        self.btn_rounds_minus.draw(screen, mouse_pos, font)
+        self.btn_rounds_plus.draw(screen, mouse_pos, font)
+        draw_label(str(match.rounds_total), left_col_x + 60, 266)
+
+        btn_play = self.btn_play
+        if snap.playing:
+            btn_play.base_color = PLAY_ACTIVE_COLOR
+            btn_play.hover_color = PLAY_ACTIVE_COLOR   # no hover during play
         else:
-            screen.blit(FONT.render(str(p1_play), True, (255,255,255)), left_center)
-
-        # CPU "shake" effect before reveal: if playing and cpu_reveal_progress < 0.6
-        if match.playing and match.mode == "Bot vs Bot":
-            # show a blurred/rotated placeholder
-            shake = math.sin(time.time()*30) * 6
-            reveal_pos = (right_center[0] + shake, right_center[1])
-            if img2:
-                im2 = scaled(img2, 140, 140)
-                screen.blit(im2, center_rect_for(im2, reveal_pos))
-            else:
-                screen.blit(FONT.render(str(p2_play), True, (255,255,255)), reveal_pos)
+            btn_play.base_color = PLAY_IDLE_COLOR
+            btn_play.hover_color = (70, 220, 70)       # lighter green on hover
+        if snap.playing:
+            btn_play.text = "Playing..."
         else:
-            if img2:
-                im2 = scaled(img2, 140, 140)
-                screen.blit(im2, center_rect_for(im2, right_center))
-            else:
-                screen.blit(FONT.render(str(p2_play), True, (255,255,255)), right_center)
+            btn_play.text = "Play Match"
 
-        # result text
-        res_txt = "Tie" if result == "tie" else ("P1 won" if result == "p1" else "P2 won")
-        screen.blit(BIG.render(res_txt, True, (255,235,120)), (right_x + 160, 360))
+        btn_play.draw(screen, mouse_pos, font)
 
-    # Draw human control buttons if in Human mode
-    if match.mode == "Human vs Bot":
-        draw_label("Your Moves:", right_x, 400)
-        btn_rock.draw(screen, mouse_pos)
-        btn_paper.draw(screen, mouse_pos)
-        btn_scissors.draw(screen, mouse_pos)
+        # Right column (game area)
+        draw_label("Scores:", right_x, 80)
+        draw_label(f"P1: {snap.results['p1']}", right_x, 120)
+        draw_label(f"P2: {snap.results['p2']}", right_x, 150)
+        draw_label(f"Ties: {snap.results['tie']}", right_x, 180)
 
-    # draw particles (confetti)
-    draw_particles(screen)
+        # Last round display with icons and small shake for CPU reveal
+        if snap.last_round:
+            p1_play, p2_play, result = snap.last_round
+            # left icon (P1)
+            left_center = (right_x + 120, 270)
+            right_center = (right_x + 340, 270)
 
-    # If Bot vs Bot finished & not yet plotted, trigger plot
-    if not match.playing and len(match.history) > 0 and plot_triggered is False:
-        # trigger only once per finished match
-        plot_triggered = True
-        end_match_and_plot_once()
-        # reset history so we don't re-plot unless new match
-        match.history = []
+            img1 = assets.image(CHOICE_ASSETS.get(p1_play))
+            img2 = assets.image(CHOICE_ASSETS.get(p2_play))
 
-    pygame.display.flip()
-
-pygame.quit()
+            if img1:
+                im1 = scaled(img1, 140, 140)
+                screen.blit(im1, center_rect_for(im1, left_center))
+            else:
+                screen.blit(render_text(font, str(p1_play), (255,255,255)), left_center)
+
+            # CPU "shake" effect before reveal: if playing and cpu_reveal_progress < 0.6
+            if snap.playing and match.mode == "Bot vs Bot":
+                # show a blurred/rotated placeholder
+                shake = math.sin(time.time()*30) * 6
+                reveal_pos = (right_center[0] + shake, right_center[1])
+                if img2:
+                    im2 = scaled(img2, 140, 140)
+                    screen.blit(im2, center_rect_for(im2, reveal_pos))
+                else:
+                    screen.blit(render_text(font, str(p2_play), (255,255,255)), reveal_pos)
+            else:
+                if img2:
+                    im2 = scaled(img2, 140, 140)
+                    screen.blit(im2, center_rect_for(im2, right_center))
+                else:
+                    screen.blit(render_text(font, str(p2_play), (255,255,255)), right_center)
+
+            # result text
+            res_txt = "Tie" if result == "tie" else ("P1 won" if result == "p1" else "P2 won")
+            screen.blit(render_text(big, res_txt, (255,235,120)), (right_x + 160, 360))
+
+        # Draw human control buttons if in Human mode
+        if match.mode == "Human vs Bot":
+            draw_label("Your Moves:", right_x, 400)
+            self.btn_rock.draw(screen, mouse_pos, font)
+            self.btn_paper.draw(screen, mouse_pos, font)
+            self.btn_scissors.draw(screen, mouse_pos, font)
+
+        # draw particles (confetti)
+        self.particles.draw(screen)
+
+    def region_states(self, mouse_pos):
+        match = self.match
+        snap = match.snapshot
+        shaking = snap.playing and match.mode == "Bot vs Bot" and snap.last_round
+        return {
+            "title": (REGION_TITLE, None),
+            "mode": (self.btn_mode.rect, (self.btn_mode.text, hovered(self.btn_mode, mouse_pos))),
+            "bot1": (REGION_BOT1, (match.bot1_idx, hovered(self.btn_bot1_left, mouse_pos),
+                                   hovered(self.btn_bot1_right, mouse_pos))),
+            "bot2": (REGION_BOT2, (match.bot2_idx, hovered(self.btn_bot2_left, mouse_pos),
+                                   hovered(self.btn_bot2_right, mouse_pos))),
+            "rounds": (REGION_ROUNDS, (match.rounds_total, hovered(self.btn_rounds_minus, mouse_pos),
+                                       hovered(self.btn_rounds_plus, mouse_pos))),
+            "play": (self.btn_play.rect, (snap.playing, hovered(self.btn_play, mouse_pos))),
+            "scores": (REGION_SCORES, tuple(snap.results.values())),
+            # the CPU shake animates every frame while a bot match is running
+            "last_round": (REGION_LAST_ROUND, (snap.last_round, time.time() if shaking else None)),
+            "moves": (REGION_MOVES, (match.mode, hovered(self.btn_rock, mouse_pos),
+                                     hovered(self.btn_paper, mouse_pos), hovered(self.btn_scissors, mouse_pos))),
+        }
+
+    # ---------- Events ----------
+    def handle_click(self, pos):
+        match = self.match
+        if self.btn_play.clicked(pos):
+            self.assets.play(ASSET_CLICK)
+            if match.mode == "Bot vs Bot":
+                match.start_bot_vs_bot()
+            else:
+                # start human match mode
+                match.start_human()
+        elif self.btn_mode.clicked(pos):
+            self.assets.play(ASSET_CLICK)
+            match.mode = "Bot vs Bot" if match.mode == "Human vs Bot" else "Human vs Bot"
+            self.btn_mode.text = f"Mode: {match.mode}"
+        elif self.btn_bot1_left.clicked(pos):
+            self.assets.play(ASSET_CLICK)
+            match.bot1_idx = (match.bot1_idx - 1) % len(BOT_LIST)
+        elif self.btn_bot1_right.clicked(pos):
+            self.assets.play(ASSET_CLICK)
+            match.bot1_idx = (match.bot1_idx + 1) % len(BOT_LIST)
+        elif self.btn_bot2_left.clicked(pos):
+            self.assets.play(ASSET_CLICK)
+            match.bot2_idx = (match.bot2_idx - 1) % len(BOT_LIST)
+        elif self.btn_bot2_right.clicked(pos):
+            self.assets.play(ASSET_CLICK)
+            match.bot2_idx = (match.bot2_idx + 1) % len(BOT_LIST)
+        elif self.btn_rounds_minus.clicked(pos):
+            self.assets.play(ASSET_CLICK)
+            match.rounds_total = max(1, match.rounds_total - 1)
+        elif self.btn_rounds_plus.clicked(pos):
+            self.assets.play(ASSET_CLICK)
+            match.rounds_total = match.rounds_total + 1
+        elif match.mode == "Human vs Bot":
+            for choice, btn in self.move_buttons.items():
+                if btn.clicked(pos):
+                    if match.run_human_vs_bot_single(choice):
+                        self.assets.play(ASSET_CLICK)
+                    break
+
+    # ---------- Main loop ----------
+    def frame(self):
+        if self.idle:
+            # nothing is moving: sleep until the next input event or timer
+            wait_ms = IDLE_WAIT_MS
+            due = self.scheduler.seconds_until_next()
+            if due is not None:
+                wait_ms = max(1, min(wait_ms, int(due * 1000) + 1))
+            events = [pygame.event.wait(wait_ms)] + pygame.event.get()
+            self.clock.tick()
+            dt = 0.0
+        else:
+            dt = self.clock.tick(FPS) / 1000.0
+            events = pygame.event.get()
+        mouse_pos = pygame.mouse.get_pos()
+
+        # event handling
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type in (pygame.VIDEORESIZE, pygame.WINDOWSIZECHANGED):
+                clear_render_caches()
+                self.full_redraw = True
+            elif event.type == pygame.WINDOWEXPOSED:
+                self.full_redraw = True
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                self.handle_click(event.pos)
+
+        # Swap in any assets the loader has finished
+        if self.assets.poll():
+            self.update_images()
+            clear_render_caches()  # drops scaled copies of the placeholders
+            self.full_redraw = True
+        if self.assets.ready and self.assets_ms is None:
+            self.assets_ms = (time.perf_counter() - self.created) * 1000
+
+        # Fire due timers (reveals, bot rounds), then update animation state
+        self.scheduler.run_due()
+        self.particles.update(dt)
+
+        # Collect the regions that changed since the last frame
+        states = self.region_states(mouse_pos)
+        if self.full_redraw:
+            dirty = [self.screen.get_rect()]
+            self.full_redraw = False
+        else:
+            dirty = [rect for name, (rect, key) in states.items()
+                     if self.prev_states.get(name, (None, object()))[1] != key]
+        bounds = self.particles.bounds()
+        for rect in (bounds, self.prev_particle_bounds):
+            if rect:
+                dirty.append(rect)
+        self.prev_states, self.prev_particle_bounds = states, bounds
+
+        if dirty:
+            self.screen.set_clip(dirty[0].unionall(dirty[1:]))
+            self.draw_scene(mouse_pos)
+            self.screen.set_clip(None)
+            pygame.display.update(dirty)
+            if self.first_frame_ms is None:
+                # the window has something on it: now start on the heavy assets
+                self.first_frame_ms = (time.perf_counter() - self.created) * 1000
+                self.assets.start_loading()
+
+        # If Bot vs Bot finished & not yet plotted, trigger plot
+        match = self.match
+        if not match.playing and len(match.history) > 0 and self.plot_triggered is False:
+            # trigger only once per finished match
+            self.plot_triggered = True
+            self.end_match_and_plot_once()
+            # reset history so we don't re-plot unless new match
+            match.history = []
+
+        # the bot-vs-bot shake is the only animation a running match has;
+        # keep ticking until the loader is done so assets appear promptly
+        animating = match.snapshot.playing and match.mode == "Bot vs Bot"
+        self.idle = not dirty and not self.particles and not animating and self.assets.ready
+
+    def run(self):
+        self.start()
+        while self.running:
+            self.frame()
+        pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rock Paper Scissors pygame frontend.")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="print time to first frame and until all assets are loaded")
+    args = parser.parse_args(argv)
+
+    app = App()
+    app.run()
+    if args.startup_time:
+        print(f"first frame: {app.first_frame_ms:.1f} ms, assets loaded: "
+              + (f"{app.assets_ms:.1f} ms" if app.assets_ms is not None else "not finished"))
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+# ---------- Move encoding ----------
+# The one move representation every engine, bot and file format shares:
+# R=0, P=1, S=2. Strings only appear at the edges (the bot call protocol,
+# printing, JSON), converted with MOVE_CODE / MOVES.
+MOVES = "RPS"
+R, P, S = 0, 1, 2
+MOVE_CODE = {"R": R, "P": P, "S": S}
+MOVE_NAMES = ("Rock", "Paper", "Scissors")
+
+# result codes follow the key order of the results dict
+RESULT_KEYS = ("p1", "p2", "tie")
+P1_WIN, P2_WIN, TIE = 0, 1, 2
+
+# OUTCOME[p1][p2] -> result code
+OUTCOME = (
+    # R       P       S        (p2)
+    (TIE,    P2_WIN, P1_WIN),  # p1 R
+    (P1_WIN, TIE,    P2_WIN),  # p1 P
+    (P2_WIN, P1_WIN, TIE),     # p1 S
+)
+
+# COUNTER[m] is the move that beats m
+COUNTER = (P, S, R)
+
+
+def winner_of(p1, p2):
+    return RESULT_KEYS[OUTCOME[MOVE_CODE[p1]][MOVE_CODE[p2]]]
@@ -0,0 +1,124 @@
+import math
+
+from rules import P1_WIN, TIE
+
+# ---------- Sequential tests ----------
+# Pass stop=MixtureTest() (or SPRT()) to RPS_game.play, main.play or
+# graph.play_games and the match ends as soon as the test is sure which
+# player is better. Only decided rounds count (a tie says nothing about who
+# is stronger), and checking after every round is fine: both tests keep
+# their error rate no matter when they are looked at.
+
+
+def _log_mixture_ratio(wins, losses, p0):
+    # log of the uniform-prior Bernoulli mixture likelihood over the
+    # likelihood at p = p0 (Robbins' mixture martingale)
+    log_marginal = math.lgamma(wins + 1) + math.lgamma(losses + 1) - math.lgamma(wins + losses + 2)
+    return log_marginal - wins * math.log(p0) - losses * math.log1p(-p0)
+
+
+def _check_rate(name, value, high):
+    if not 0 < value < high:
+        raise ValueError(f"{name} must be between 0 and {high}, got {value}")
+
+
+class _SequentialTest:
+    def __init__(self, alpha):
+        _check_rate("alpha", alpha, 1)
+        self.alpha = alpha
+        self.wins = self.losses = self.rounds = 0
+        self.decision = None
+
+    def update(self, result):
+        # feed one round's result code; True once the match can stop
+        self.rounds += 1
+        if result == TIE:
+            return False
+        if result == P1_WIN:
+            self.wins += 1
+        else:
+            self.losses += 1
+        self.decision = self._decide()
+        return self.decision is not None
+
+    def interval(self):
+        # always-valid (1 - alpha) confidence sequence for p1's share of the
+        # decided rounds: every p0 the mixture test can't reject yet
+        w, l = self.wins, self.losses
+        if not w + l:
+            return 0.0, 1.0
+        bound = math.log(1 / self.alpha)
+        p_hat = min(max(w / (w + l), 1e-12), 1 - 1e-12)
+
+        def inside(p0):
+            return _log_mixture_ratio(w, l, p0) < bound
+
+        def edge(lo, hi, lo_inside):
+            for _ in range(60):
+                mid = (lo + hi) / 2
+                if inside(mid) == lo_inside:
+                    lo = mid
+                else:
+                    hi = mid
+            return (lo + hi) / 2
+
+        low = 0.0 if inside(1e-12) else edge(1e-12, p_hat, False)
+        high = 1.0 if inside(1 - 1e-12) else edge(p_hat, 1 - 1e-12, True)
+        return low, high
+
+    def report(self, planned=None):
+        low, high = self.interval()
+        out = {
+            "test": type(self).__name__,
+            "alpha": self.alpha,
+            "decision": self.decision,
+            "rounds": self.rounds,
+            "wins": self.wins,
+            "losses": self.losses,
+            "interval": [low, high],
+        }
+        if planned is not None:
+            out["rounds_saved"] = planned - self.rounds
+        return out
+
+
+class MixtureTest(_SequentialTest):
+    # Stops once p = 1/2 is rejected at level alpha: the mixture likelihood
+    # ratio is a test martingale, so by Ville's inequality it crosses 1/alpha
+    # with probability at most alpha when the players are even. So even
+    # players are declared different with probability at most alpha, and
+    # otherwise the match just runs to the end.
+    def __init__(self, alpha=0.05):
+        super().__init__(alpha)
+        self.bound = math.log(1 / alpha)
+
+    def _decide(self):
+        if _log_mixture_ratio(self.wins, self.losses, 0.5) < self.bound:
+            return None
+        return "p1" if self.wins > self.losses else "p2"
+
+
+class SPRT(_SequentialTest):
+    # Wald's test of p = 1/2 + delta (p1 better) against p = 1/2 - delta
+    # (p2 better). Stops sooner than MixtureTest but always picks a side,
+    # so it answers "which is better, given one is better by delta".
+    def __init__(self, alpha=0.05, delta=0.05, beta=None):
+        super().__init__(alpha)
+        beta = alpha if beta is None else beta
+        _check_rate("beta", beta, 1)
+        _check_rate("delta", delta, 0.5)
+        self.delta = delta
+        self.step = math.log((0.5 + delta) / (0.5 - delta))
+        self.upper = math.log((1 - beta) / alpha)
+        self.lower = math.log(beta / (1 - alpha))
+
+    def _decide(self):
+        llr = (self.wins - self.losses) * self.step
+        if llr >= self.upper:
+            return "p1"
+        if llr <= self.lower:
+            return "p2"
+        return None
+
+
+TESTS = {"mixture": MixtureTest, "sprt": SPRT}
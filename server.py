@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+
+import registry
+from RPS_game import seed_players
+from rules import MOVE_CODE, OUTCOME, RESULT_KEYS
+
+# Line-based JSON over TCP, one session per connection. Each request is a
+# JSON object on its own line and gets exactly one JSON line back:
+#
+#   {"op": "start", "bot2": "markov_chain"}               human vs bot
+#   {"op": "start", "bot1": "easy2", "bot2": "medium2"}   bot vs bot
+#       optional "seed"; replies {"ok": true, "seed": ...}
+#   {"op": "move", "move": "R"}        one human round
+#   {"op": "play", "rounds": 1000}     bot vs bot rounds, replies with the score
+#   {"op": "score"} / {"op": "quit"}
+#
+# Requests on a connection are handled one at a time and every reply waits
+# for the socket to drain, so a client that sends faster than it reads is
+# slowed down by TCP instead of growing buffers here. A client that stops
+# reading altogether is dropped after the idle timeout.
+DEFAULT_PORT = 8765
+MAX_SESSIONS = 10_000
+IDLE_TIMEOUT = 30.0
+MAX_LINE = 4096
+MAX_BATCH = 1_000_000
+YIELD_EVERY = 1000  # rounds of a batch between yields to other sessions
+
+
+class Session:
+    def __init__(self, bot2, bot1=None, seed=None):
+        self.seed = random.SystemRandom().getrandbits(32) if seed is None else seed
+        self.names = (bot1, bot2)
+        self.bot1 = registry.make(bot1) if bot1 else None
+        self.bot2 = registry.make(bot2)
+        seed_players(self.seed, self.bot1, self.bot2)
+        self.p1_prev = self.p2_prev = ""
+        self.counts = [0, 0, 0]  # by result code
+        self.rounds = 0
+
+    @property
+    def results(self):
+        return dict(zip(RESULT_KEYS, self.counts))
+
+    def play_round(self, p1_play=None):
+        # same turn order as main.play: each side sees the other's last move
+        if p1_play is None:
+            p1_play = self.bot1(self.p1_prev)
+        p2_play = self.bot2(self.p2_prev)
+        code = OUTCOME[MOVE_CODE[p1_play]][MOVE_CODE[p2_play]]
+        self.counts[code] += 1
+        self.rounds += 1
+        self.p1_prev, self.p2_prev = p2_play, p1_play
+        return p1_play, p2_play, RESULT_KEYS[code]
+
+    def score(self):
+        return {"rounds": self.rounds, "results": self.results}
+
+
+class MatchServer:
+    def __init__(self, max_sessions=MAX_SESSIONS, idle_timeout=IDLE_TIMEOUT, max_batch=MAX_BATCH):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_batch = max_batch
+        self.active = 0
+        self.stats = {"sessions": 0, "rejected": 0, "timeouts": 0, "rounds": 0}
+
+    async def handle(self, reader, writer):
+        if self.active >= self.max_sessions:
+            self.stats["rejected"] += 1
+            try:
+                await self.send(writer, {"error": "server busy"})
+            except ConnectionError:
+                pass
+            writer.close()
+            return
+
+        self.active += 1
+        self.stats["sessions"] += 1
+        session = None
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                # a plain timer is much cheaper than wait_for's task per line;
+                # closing the socket ends the pending readline
+                timer = loop.call_later(self.idle_timeout, self.expire, writer)
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await self.send(writer, {"error": f"line longer than {MAX_LINE} bytes"})
+                    break
+                finally:
+                    timer.cancel()
+                if not line:
+                    break
+
+                try:
+                    request = json.loads(line)
+                    session, reply = await self.dispatch(session, request)
+                except KeyError as e:
+                    reply = {"error": f"missing field {e}"}
+                except (ValueError, TypeError, AttributeError) as e:
+                    reply = {"error": str(e)}
+                await self.send(writer, reply)
+                if reply.get("bye"):
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.active -= 1
+            writer.close()
+
+    def expire(self, writer):
+        self.stats["timeouts"] += 1
+        writer.write(b'{"error": "idle timeout"}\n')
+        writer.close()
+
+    async def send(self, writer, reply):
+        writer.write(json.dumps(reply).encode() + b"\n")
+        # a client that stops reading gets the same idle deadline as one that
+        # stops sending; drain only waits once the write buffer is full
+        try:
+            await asyncio.wait_for(writer.drain(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            writer.transport.abort()
+            raise ConnectionError("client stopped reading")
+
+    async def dispatch(self, session, request):
+        op = request.get("op")
+        if op == "start":
+            bot1, bot2 = request.get("bot1"), request["bot2"]
+            for key in (bot1, bot2):
+                if key is not None and key not in registry.keys():
+                    raise ValueError(f"unknown bot {key!r}")
+            session = Session(bot2, bot1, request.get("seed"))
+            return session, {"ok": True, "seed": session.seed}
+        if op == "quit":
+            return session, {"bye": True, **(session.score() if session else {})}
+        if session is None:
+            raise ValueError("no session, send start first")
+
+        if op == "move":
+            if session.bot1 is not None:
+                raise ValueError("bot vs bot session, use play")
+            move = request["move"]
+            if move not in ("R", "P", "S"):
+                raise ValueError(f"invalid move {move!r}")
+            p1_play, p2_play, result = session.play_round(move)
+            self.stats["rounds"] += 1
+            return session, {"round": session.rounds, "you": p1_play, "bot": p2_play,
+                             "result": result, "results": session.results}
+        if op == "play":
+            if session.bot1 is None:
+                raise ValueError("human vs bot session, use move")
+            rounds = int(request.get("rounds", 1))
+            if not 0 < rounds <= self.max_batch:
+                raise ValueError(f"rounds must be 1..{self.max_batch}")
+            for i in range(rounds):
+                session.play_round()
+                if (i + 1) % YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
+            self.stats["rounds"] += rounds
+            return session, session.score()
+        if op == "score":
+            return session, session.score()
+        raise ValueError(f"unknown op {op!r}")
+
+
+async def serve(host, port, server):
+    listener = await asyncio.start_server(server.handle, host, port, limit=MAX_LINE, backlog=1024)
+    print(f"serving on {host}:{port}", file=sys.stderr)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve rock paper scissors matches over TCP (JSON lines).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS)
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT, help="seconds")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="most rounds per play request")
+    args = parser.parse_args(argv)
+
+    server = MatchServer(args.max_sessions, args.idle_timeout, args.max_batch)
+    try:
+        asyncio.run(serve(args.host, args.port, server))
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(server.stats), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
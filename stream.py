@@ -0,0 +1,118 @@
+import collections
+import itertools
+import json
+
+from RPS_game import RollingCounter, seed_players
+from rules import MOVE_CODE, MOVES, OUTCOME, P1_WIN, P2_WIN, RESULT_KEYS, TIE
+
+# ---------- Streaming matches ----------
+# iter_play is an endless match that yields one small Round per round;
+# the stages below take an iterable of rounds and yield rounds again, so
+# they chain like pipes and nothing keeps the whole history:
+#
+#   rounds = iter_play(bot1, bot2, seed=1)
+#   rounds = take(to_file(rounds, "match.jsonl"), 1_000_000)
+#   for stats in windowed(rounds, 1000, every=1000):
+#       ...
+#
+# Closing the generator (or breaking out of the loop) ends the match.
+
+# moves and outcome are rules codes; index counts from 1
+Round = collections.namedtuple("Round", "index p1 p2 outcome p1_wins p2_wins ties")
+WindowStats = collections.namedtuple("WindowStats", "index rounds p1_wins p2_wins ties")
+
+
+def iter_play(player1, player2, seed=None):
+    # same turn order as main.play: each side sees the other's last move
+    if seed is not None:
+        player1, player2 = seed_players(seed, player1, player2)
+    p1_prev = p2_prev = ""
+    score = [0, 0, 0]
+    for index in itertools.count(1):
+        p1_play = player1(p1_prev)
+        p2_play = player2(p2_prev)
+        p1, p2 = MOVE_CODE[p1_play], MOVE_CODE[p2_play]
+        outcome = OUTCOME[p1][p2]
+        score[outcome] += 1
+        yield Round(index, p1, p2, outcome, score[P1_WIN], score[P2_WIN], score[TIE])
+        p1_prev, p2_prev = p2_play, p1_play
+
+
+# ---------- Stages ----------
+def take(rounds, n):
+    return itertools.islice(rounds, n)
+
+
+def until(rounds, condition):
+    # stops after the first round for which condition(round) is true
+    for r in rounds:
+        yield r
+        if condition(r):
+            return
+
+
+def tap(rounds, fn):
+    for r in rounds:
+        fn(r)
+        yield r
+
+
+def windowed(rounds, size, every=1):
+    # p1/p2/tie counts over the last `size` rounds, every `every` rounds
+    window = RollingCounter(size, (P1_WIN, P2_WIN, TIE))
+    for r in rounds:
+        window.push(r.outcome)
+        if r.index % every == 0:
+            yield WindowStats(r.index, len(window), window.count(P1_WIN),
+                              window.count(P2_WIN), window.count(TIE))
+
+
+def last(rounds):
+    # runs the pipeline to the end and returns the final item (None if empty)
+    tail = collections.deque(rounds, maxlen=1)
+    return tail[0] if tail else None
+
+
+# ---------- Sinks ----------
+# Sinks pass rounds through unchanged, so they can sit anywhere in a chain.
+def to_json(r):
+    return json.dumps({"round": r.index, "p1": MOVES[r.p1], "p2": MOVES[r.p2],
+                       "result": RESULT_KEYS[r.outcome],
+                       "score": [r.p1_wins, r.p2_wins, r.ties]}, separators=(",", ":"))
+
+
+def _write_lines(rounds, write, flush, batch):
+    lines = []
+    try:
+        for r in rounds:
+            lines.append(to_json(r))
+            if len(lines) >= batch:
+                write("\n".join(lines) + "\n")
+                lines.clear()
+            yield r
+    finally:
+        # also runs when the consumer stops early
+        if lines:
+            write("\n".join(lines) + "\n")
+        flush()
+
+
+def to_file(rounds, path_or_file, batch=1000):
+    # one JSON line per round
+    if hasattr(path_or_file, "write"):
+        yield from _write_lines(rounds, path_or_file.write, path_or_file.flush, batch)
+        return
+    with open(path_or_file, "w") as f:
+        yield from _write_lines(rounds, f.write, f.flush, batch)
+
+
+def to_socket(rounds, sock, batch=100):
+    # the same JSON lines, sent with sock.sendall (match server format)
+    yield from _write_lines(rounds, lambda text: sock.sendall(text.encode()), lambda: None, batch)
+
+
+def to_matchlog(rounds, writer):
+    # records moves to a matchlog.MatchLogWriter; the caller closes it
+    for r in rounds:
+        writer.record(MOVES[r.p1], MOVES[r.p2])
+        yield r
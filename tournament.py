@@ -0,0 +1,174 @@
+import argparse
+import csv
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from RPS_game import seed_players
+import registry
+import vector_engine
+
+
+# ---------- Worker ----------
+def play_pairing(job):
+    # runs in a worker process: fresh bots, so no state leaks between matches
+    name1, name2, seed, rounds = job
+    bot1, bot2 = seed_players(seed, registry.make(name1), registry.make(name2))
+    p1_moves, p2_moves = vector_engine.match_moves(bot1, bot2, rounds)
+    results, _ = vector_engine.score(p1_moves, p2_moves)
+    return name1, name2, results
+
+
+def uses_rng(name):
+    # bots without an RNG play the same match for every seed
+    return hasattr(registry.make(name), "rng")
+
+
+# ---------- Statistics ----------
+# Each seed's match is one observation (its win rate over decided rounds);
+# rounds within a match are not independent trials, so the interval is a
+# Student t interval over the per-match rates.
+def _t_cdf(x, df, steps=200):
+    # P(T <= x) for x >= 0, Simpson's rule on the density from 0 to x
+    log_norm = math.lgamma((df + 1) / 2) - math.lgamma(df / 2) - 0.5 * math.log(df * math.pi)
+
+    def pdf(t):
+        return math.exp(log_norm - (df + 1) / 2 * math.log1p(t * t / df))
+
+    h = x / steps
+    area = pdf(0) + pdf(x) + sum((4 if k % 2 else 2) * pdf(k * h) for k in range(1, steps))
+    return 0.5 + area * h / 3
+
+
+def t_quantile(p, df):
+    # upper quantile for p >= 0.5, by bisection on the CDF
+    low, high = 0.0, 1.0
+    while _t_cdf(high, df) < p:
+        low, high = high, high * 2
+    for _ in range(50):
+        mid = (low + high) / 2
+        if _t_cdf(mid, df) < p:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+def t_interval(rates, confidence=0.95):
+    # None when there is no spread to estimate from (fewer than 2 matches)
+    n = len(rates)
+    if n < 2:
+        return None
+    mean = sum(rates) / n
+    sd = math.sqrt(sum((r - mean) ** 2 for r in rates) / (n - 1))
+    half = t_quantile(0.5 + confidence / 2, n - 1) * sd / math.sqrt(n)
+    return max(0.0, mean - half), min(1.0, mean + half)
+
+
+def run_tournament(names, seeds, rounds, workers=None, confidence=0.95):
+    random_bots = {name for name in names if uses_rng(name)}
+    jobs = []
+    for a in names:
+        for b in names:
+            # a pairing with no RNG replays the same match on every seed
+            matches = seeds if a in random_bots or b in random_bots else 1
+            jobs += [(a, b, seed, rounds) for seed in range(matches)]
+    totals = {(a, b): {"p1": 0, "p2": 0, "tie": 0} for a in names for b in names}
+    rates = {(a, b): [] for a in names for b in names}
+    played = dict.fromkeys(totals, 0)
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for name1, name2, results in pool.map(play_pairing, jobs, chunksize=chunksize):
+            cell = totals[name1, name2]
+            played[name1, name2] += 1
+            for key, value in results.items():
+                cell[key] += value
+            decided = results["p1"] + results["p2"]
+            if decided:
+                rates[name1, name2].append(results["p1"] / decided)
+
+    rows = []
+    for (name1, name2), cell in totals.items():
+        cell_rates = rates[name1, name2]
+        win_rate = sum(cell_rates) / len(cell_rates) if cell_rates else 0.0
+        deterministic = name1 not in random_bots and name2 not in random_bots
+        if deterministic:
+            # every seed plays this exact match: its rate has no sampling error
+            interval = (win_rate, win_rate)
+        else:
+            interval = t_interval(cell_rates, confidence) or (0.0, 1.0)
+        rows.append({
+            "bot1": name1,
+            "bot2": name2,
+            "matches": played[name1, name2],
+            "wins": cell["p1"],
+            "losses": cell["p2"],
+            "ties": cell["tie"],
+            "win_rate": win_rate,
+            "ci_low": interval[0],
+            "ci_high": interval[1],
+        })
+    return rows
+
+
+def matrix(rows, names, key):
+    lookup = {(r["bot1"], r["bot2"]): r[key] for r in rows}
+    return [[lookup[a, b] for b in names] for a in names]
+
+
+# ---------- Output ----------
+FIELDS = ("bot1", "bot2", "matches", "wins", "losses", "ties", "win_rate", "ci_low", "ci_high")
+
+
+def write_table(rows, out):
+    widths = {f: max(len(f), *(len(_fmt(r[f])) for r in rows)) for f in FIELDS}
+    out.write("  ".join(f.ljust(widths[f]) for f in FIELDS) + "\n")
+    for r in rows:
+        out.write("  ".join(_fmt(r[f]).ljust(widths[f]) for f in FIELDS) + "\n")
+
+
+def write_matrix(rows, names, key, out):
+    # rows are bot 1, columns bot 2
+    cells = matrix(rows, names, key)
+    width = max(len(n) for n in names)
+    col = max(width, *(len(str(v)) for line in cells for v in line))
+    out.write(f"\n{key} (row = bot 1, column = bot 2, summed over the pairing's matches)\n")
+    out.write(" " * width + "  " + "  ".join(n.rjust(col) for n in names) + "\n")
+    for name, line in zip(names, cells):
+        out.write(name.ljust(width) + "  " + "  ".join(str(v).rjust(col) for v in line) + "\n")
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _fmt(value):
+    return f"{value:.4f}" if isinstance(value, float) else str(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Round-robin tournament between all registered bots.")
+    parser.add_argument("--rounds", type=int, default=1000, help="rounds per match")
+    parser.add_argument("--seeds", type=int, default=10, help="matches per pairing")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--bots", nargs="+", choices=registry.keys(), default=registry.keys(), metavar="KEY")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--csv", help="also write the table to this CSV file")
+    args = parser.parse_args(argv)
+
+    rows = run_tournament(args.bots, args.seeds, args.rounds, args.workers, args.confidence)
+    write_table(rows, sys.stdout)
+    for key in ("wins", "ties", "losses"):
+        write_matrix(rows, args.bots, key, sys.stdout)
+    if args.csv:
+        write_csv(rows, args.csv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import numpy as np
+
+import rules
+from RPS_game import Easy1Bot, RandomBot, bot_for, seed_players
+from rules import MOVE_CODE, MOVES, RESULT_KEYS
+
+# the rules tables as arrays, so whole matches score in one lookup
+OUTCOME = np.array(rules.OUTCOME, dtype=np.int8)
+COUNTER = np.array(rules.COUNTER, dtype=np.int8)
+
+_RESULT_NAMES = np.array(RESULT_KEYS)
+
+
+def encode(moves):
+    return np.array([MOVE_CODE[m] for m in moves], dtype=np.int8)
+
+
+def decode(codes):
+    return [MOVES[c] for c in np.asarray(codes).tolist()]
+
+
+# ---------- Scoring ----------
+def score(p1_moves, p2_moves):
+    # one table lookup for the whole match
+    outcomes = OUTCOME[p1_moves, p2_moves]
+    counts = np.bincount(outcomes, minlength=3)
+    results = {key: int(counts[i]) for i, key in enumerate(RESULT_KEYS)}
+    return results, outcomes
+
+
+def history_of(outcomes):
+    return _RESULT_NAMES[outcomes].tolist()
+
+
+def running_totals(outcomes):
+    # cumulative p1 / p2 / tie counts after every round, shape (n, 3)
+    onehot = np.zeros((len(outcomes), 3), dtype=np.int64)
+    onehot[np.arange(len(outcomes)), outcomes] = 1
+    return np.cumsum(onehot, axis=0)
+
+
+# ---------- Bulk move generators ----------
+# Bots whose output never depends on the opponent can produce a whole
+# match worth of moves at once. Each generator advances the bot's state
+# exactly as n single calls would.
+def _easy1_bulk(bot, n):
+    idx = (bot.counter + 1 + np.arange(n)) % len(bot.choices)
+    bot.counter += n
+    return encode(bot.choices)[idx]
+
+
+def _random_bulk(bot, n):
+    # the same draws as n calls (see RandomBot)
+    return np.array(bot.rng.choices((0, 1, 2), k=n), dtype=np.int8)
+
+
+BULK_GENERATORS = {
+    Easy1Bot: _easy1_bulk,
+    RandomBot: _random_bulk,
+}
+
+
+def _bulk_for(bot, n):
+    generator = BULK_GENERATORS.get(type(bot))
+    if generator is None:
+        return None
+    return lambda: generator(bot, n)
+
+
+def _moves_against(player, opponent_moves):
+    # player sees the opponent's previous move, "" on the first round
+    out = np.empty(len(opponent_moves), dtype=np.int8)
+    prev = ""
+    for i, opp in enumerate(opponent_moves.tolist()):
+        out[i] = MOVE_CODE[player(prev)]
+        prev = MOVES[opp]
+    return out
+
+
+def _moves_both(player1, player2, num_games):
+    p1_moves = np.empty(num_games, dtype=np.int8)
+    p2_moves = np.empty(num_games, dtype=np.int8)
+    p1_prev = p2_prev = ""
+    for i in range(num_games):
+        p1_play = player1(p2_prev)
+        p2_play = player2(p1_prev)
+        p1_moves[i] = MOVE_CODE[p1_play]
+        p2_moves[i] = MOVE_CODE[p2_play]
+        p1_prev, p2_prev = p1_play, p2_play
+    return p1_moves, p2_moves
+
+
+def match_moves(player1, player2, num_games):
+    bot1, bot2 = bot_for(player1), bot_for(player2)
+    bulk1 = _bulk_for(bot1, num_games)
+    bulk2 = _bulk_for(bot2, num_games)
+    if bot1 is bot2:
+        # a bot playing itself shares state, so its calls must interleave
+        bulk1 = bulk2 = None
+
+    if bulk1 and bulk2:
+        return bulk1(), bulk2()
+    if bulk1:
+        p1_moves = bulk1()
+        return p1_moves, _moves_against(player2, p1_moves)
+    if bulk2:
+        p2_moves = bulk2()
+        return _moves_against(player1, p2_moves), p2_moves
+    return _moves_both(player1, player2, num_games)
+
+
+# ---------- PLAY Function ----------
+def play(player1, player2, num_games, log=None, seed=None):
+    # drop-in for main.play / graph.play_games: same results dict and history
+    if seed is not None:
+        player1, player2 = seed_players(seed, player1, player2)
+    p1_moves, p2_moves = match_moves(player1, player2, num_games)
+    if log is not None:
+        log.extend(p1_moves, p2_moves)
+    results, outcomes = score(p1_moves, p2_moves)
+    return results, history_of(outcomes)